@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+""" Benchmarks of the typogenetics hot paths.
+
+Run from the repository root with:
+
+    python -m benchmarks.run [--sizes 10,1000,100000] [--quick]
+"""
+
+from typogenetics.strand import Strand
+from typogenetics.enzyme import Enzyme, binding_preference
+from typogenetics.amino_acid import AminoAcid, AMINO_ACIDS
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import apply_enzyme, apply_enzyme_batch, CompiledEnzyme, OutOfStrandException
+from typogenetics.manipulation import StrandManipulationBuffer, ArrayStrandManipulationBuffer
+from typogenetics.manipulation import StatusArrayStrandManipulationBuffer
+from typogenetics.evolve import evolve
+from typogenetics.backend import BACKEND
+
+import argparse
+import random
+import resource
+import timeit
+
+BUFFER_CLASSES = [StrandManipulationBuffer, ArrayStrandManipulationBuffer, StatusArrayStrandManipulationBuffer]
+
+
+def random_strand_str(rng, length):
+    return ''.join(rng.choice('ACGT') for _ in range(length))
+
+
+def random_enzyme(rng, length):
+    return Enzyme([AminoAcid(rng.choice(AMINO_ACIDS[1:])) for _ in range(length)])
+
+
+def peak_memory_mb():
+    """ Peak resident memory of this process so far """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def bench(name, func, bases=None, enzymes=None, min_time=0.2, repeat=3):
+    """ Time func, scaling the number of calls up to at least min_time per run,
+        and print the best time per call along with the throughputs """
+    # timeit turns off the garbage collector, which would let reference cycles pile up
+    timer = timeit.Timer(func, 'import gc; gc.enable()')
+    number = 1
+    while timer.timeit(number) < min_time and number < 10 ** 6:
+        number *= 10
+    per_call = min(timer.repeat(repeat, number)) / number
+
+    line = '%-56s %12.2f us' % (name, per_call * 1e6)
+    if bases is not None:
+        line += '  %12.0f bases/s' % (bases / per_call)
+    if enzymes is not None:
+        line += '  %10.0f enzymes/s' % (enzymes / per_call)
+    line += '  %8.1f MB peak' % peak_memory_mb()
+    print line
+
+
+def bench_strands(rng, length, min_time):
+    s = random_strand_str(rng, length)
+    strand = Strand(s)
+    enzymes = strand_to_enzymes(strand)
+    bench('Strand(%d)' % length, lambda: Strand(s), bases=length, min_time=min_time)
+    bench('strand_to_enzymes(%d)' % length, lambda: strand_to_enzymes(strand),
+          bases=length, enzymes=len(enzymes), min_time=min_time)
+
+
+def bench_binding_preference(rng, min_time):
+    amino_acids = random_enzyme(rng, 12).amino_acids
+    bench('binding_preference(12 amino acids)', lambda: binding_preference(amino_acids),
+          enzymes=1, min_time=min_time)
+
+
+def bench_ops(rng, length, min_time):
+    s = random_strand_str(rng, length)
+    middle = length // 2
+
+    def run_op(buffer_class, op):
+        sm = buffer_class(s)
+        sm.seek(middle)
+        sm.cop()
+        try:
+            sm(op)
+        except OutOfStrandException:
+            pass
+
+    for buffer_class in BUFFER_CLASSES:
+        # the cost of setting up the buffer, to subtract from the op timings
+        bench('%s setup(%d)' % (buffer_class.__name__, length),
+              lambda: buffer_class(s).seek(middle), min_time=min_time)
+        for op in AMINO_ACIDS[1:]:
+            bench('%s.%s(%d)' % (buffer_class.__name__, op, length),
+                  lambda: run_op(buffer_class, op), min_time=min_time)
+
+
+def bench_apply_enzyme(rng, length, min_time):
+    strand = Strand(random_strand_str(rng, length))
+    enzyme = random_enzyme(rng, 12)
+    for buffer_class in BUFFER_CLASSES:
+        compiled = CompiledEnzyme(enzyme, buffer_class)
+        bench('apply_enzyme %s(%d)' % (buffer_class.__name__, length),
+              lambda: apply_enzyme(strand, enzyme, buffer_class=buffer_class), bases=length, min_time=min_time)
+        bench('apply_enzyme compiled %s(%d)' % (buffer_class.__name__, length),
+              lambda: apply_enzyme(strand, compiled), bases=length, min_time=min_time)
+
+    strands = [Strand(random_strand_str(rng, length)) for _ in range(100)]
+    bench('apply_enzyme_batch 100 x (%d)' % length,
+          lambda: apply_enzyme_batch(strands, enzyme, ArrayStrandManipulationBuffer),
+          bases=100 * length, min_time=min_time)
+
+
+def bench_random_workload(rng, length, min_time):
+    """ Every strand's own enzymes applied to it, for a batch of random strands.
+        Most of these applications end by running out of strand. """
+    pairs = []
+    for _ in range(100):
+        strand = Strand(random_strand_str(rng, length))
+        pairs.extend((strand, enzyme) for enzyme in strand_to_enzymes(strand))
+
+    for buffer_class in BUFFER_CLASSES:
+        compiled = dict((enzyme, CompiledEnzyme(enzyme, buffer_class)) for strand, enzyme in pairs)
+
+        def run():
+            for strand, enzyme in pairs:
+                apply_enzyme(strand, compiled[enzyme])
+
+        bench('random workload %s 100 x (%d)' % (buffer_class.__name__, length), run,
+              bases=100 * length, enzymes=len(pairs), min_time=min_time)
+
+
+def bench_cycle(rng, min_time):
+    population = [Strand(random_strand_str(rng, 100)) for _ in range(100)]
+
+    def run():
+        for generation, next_population in evolve(population, 3, processes=1, population_cap=1000, seed=0):
+            pass
+
+    bench('evolve 100 x (100), 3 generations', run, bases=100 * 100, min_time=min_time, repeat=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10,1000,100000', help='comma separated strand lengths')
+    parser.add_argument('--quick', action='store_true', help='shorter timing runs')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sizes = [int(size) for size in args.sizes.split(',')]
+    min_time = 0.02 if args.quick else 0.2
+
+    print 'typogenetics._core backend: %s' % BACKEND
+    for length in sizes:
+        bench_strands(rng, length, min_time)
+    bench_binding_preference(rng, min_time)
+    for length in sizes:
+        bench_ops(rng, length, min_time)
+    for length in sizes:
+        bench_apply_enzyme(rng, length, min_time)
+    for length in sizes:
+        bench_random_workload(rng, length, min_time)
+    bench_cycle(rng, min_time)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,8 @@ from typogenetics.amino_acid import AminoAcid, InvalidAminoAcid
 
 from nose.tools import assert_raises_regexp
 
+import pickle
+
 class TestAminoAcid:
 
     def test_constructor(self):
@@ -10,3 +12,14 @@ class TestAminoAcid:
     def test_invalid_op(self):
         with assert_raises_regexp(InvalidAminoAcid, 'Not a valid amino acid'):
             AminoAcid('cat')
+
+    def test_interned(self):
+        assert(AminoAcid('cut') is AminoAcid('cut'))
+        assert(AminoAcid('cut') != AminoAcid('cop'))
+
+    def test_pickle(self):
+        assert(pickle.loads(pickle.dumps(AminoAcid('swi'), 2)) is AminoAcid('swi'))
+
+    def test_unhashable_op(self):
+        with assert_raises_regexp(InvalidAminoAcid, 'Not a valid amino acid'):
+            AminoAcid(['cut'])
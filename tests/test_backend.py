@@ -0,0 +1,43 @@
+from typogenetics.backend import BACKEND, COMPILED, PURE_PYTHON_ENV, SOURCE_PATH, is_compiled
+from typogenetics.manipulation import apply_enzyme, CompiledEnzyme
+from typogenetics.enzyme import Enzyme
+from typogenetics.strand import Strand
+from typogenetics.amino_acid import AminoAcid, AMINO_ACIDS
+
+from nose.plugins.skip import SkipTest
+
+import imp
+import os
+import random
+
+class TestBackend:
+
+    def test_selected(self):
+        assert(BACKEND == ('cython' if COMPILED else 'python'))
+        if os.environ.get(PURE_PYTHON_ENV):
+            assert(not COMPILED)
+
+    def test_matches_pure_python(self):
+        # the other test runs go through the selected backend, this compares
+        # the compiled one, when built, with the plain Python source
+        if not COMPILED:
+            raise SkipTest('typogenetics._core is not compiled')
+        pure = imp.load_source('typogenetics._core_python', SOURCE_PATH)
+        assert(not is_compiled(pure))
+
+        rng = random.Random(5)
+        ops = AMINO_ACIDS[1:] + ['cop', 'rpy', 'rpu', 'lpy', 'lpu']
+        for i in range(2000):
+            s = Strand(''.join(rng.choice('ACGT') for _ in range(rng.randint(1, 30))))
+            e = Enzyme([AminoAcid(rng.choice(ops)) for _ in range(rng.randint(0, 12))])
+            expected = [strand.strand for strand in apply_enzyme(s, e)]
+
+            site = s.strand.find(e.binding_preference)
+            if site == -1:
+                continue
+            sm = pure.ArrayStrandManipulationBuffer(s.strand)
+            sm.seek(site)
+            pure.run_program(sm, CompiledEnzyme(e, pure.ArrayStrandManipulationBuffer).program)
+            sm.primary_strands.append(sm.primary.dump())
+            sm.secondary_strands.append(sm.secondary.dump())
+            assert(pure.collect_strands(sm.primary_strands, sm.secondary_strands) == expected)
@@ -0,0 +1,72 @@
+from typogenetics.cache import LRUCache, TypogeneticsCache, enzyme_key
+from typogenetics.strand import Strand
+from typogenetics.enzyme import Enzyme
+from typogenetics.amino_acid import AminoAcid
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import apply_enzyme, CompiledEnzyme
+from typogenetics.evolve import cycle
+
+import os
+import tempfile
+
+class TestLRUCache:
+
+    def test_eviction(self):
+        c = LRUCache(max_size=2)
+        c.put('a', 1)
+        c.put('b', 2)
+        assert(c.get('a') == 1)  # 'b' is now the least recently used
+        c.put('c', 3)
+        assert(c.get('b') is None)
+        assert(c.get('a') == 1)
+        assert(c.get('c') == 3)
+        assert(len(c) == 2)
+        assert(c.hits == 3 and c.misses == 1)
+
+
+class TestTypogeneticsCache:
+
+    def test_enzyme_key(self):
+        e = Enzyme([AminoAcid('rpy'), AminoAcid('cop')])
+        assert(enzyme_key(e) == ('rpy', 'cop'))
+        assert(enzyme_key(CompiledEnzyme(e)) == ('rpy', 'cop'))
+
+    def test_strand_to_enzymes(self):
+        cache = TypogeneticsCache()
+        s = Strand('CGGATACTAAACCGA')
+        expected = [enzyme_key(e) for e in strand_to_enzymes(s)]
+        assert([enzyme_key(e) for e in cache.strand_to_enzymes(s)] == expected)
+        assert([enzyme_key(e) for e in cache.strand_to_enzymes(Strand('CGGATACTAAACCGA'))] == expected)
+        assert(cache.stats()['strand_to_enzymes'] == {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_apply_enzyme_not_shared(self):
+        cache = TypogeneticsCache()
+        s = Strand('CAAAGAGAATCCTCTTTGAT')
+        e = Enzyme([AminoAcid('rpy'), AminoAcid('cop'), AminoAcid('rpu'), AminoAcid('cut')])
+        first = cache.apply_enzyme(s, e)
+        first.pop()
+        second = cache.apply_enzyme(s, e)
+        assert([d.strand for d in second] == [d.strand for d in apply_enzyme(s, e)])
+        assert(cache.stats()['apply_enzyme']['hits'] == 1)
+
+    def test_cycle(self):
+        cache = TypogeneticsCache()
+        s = Strand('TAGATCCAGTCCACTCGA')
+        expected = [d.strand for d in cycle(s)]
+        assert([d.strand for d in cycle(s, cache=cache)] == expected)
+        assert([d.strand for d in cycle(s, cache=cache)] == expected)
+
+    def test_save_load(self):
+        cache = TypogeneticsCache()
+        s = Strand('TAGATCCAGTCCACTCGA')
+        cycle(s, cache=cache)
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            cache.save(path)
+            loaded = TypogeneticsCache()
+            loaded.load(path)
+        finally:
+            os.remove(path)
+        assert([d.strand for d in cycle(s, cache=loaded)] == [d.strand for d in cycle(s)])
+        assert(loaded.stats()['apply_enzyme']['misses'] == 0)
@@ -0,0 +1,108 @@
+from typogenetics.dedup import BloomFilter, GenerationIndex, index_generation
+from typogenetics.strand import Strand
+from typogenetics.evolve import cycle_str
+
+from nose.tools import assert_raises
+
+from collections import Counter
+import multiprocessing
+import pickle
+import random
+
+def random_strs(seed, count, max_length=12):
+    rng = random.Random(seed)
+    return [''.join(rng.choice('ACGT') for _ in range(rng.randint(0, max_length))) for _ in range(count)]
+
+class TestBloomFilter:
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        keys = random_strs(0, 1000, 30)
+        for key in keys:
+            bloom.add(key)
+        assert(all(key in bloom for key in keys))
+        # about 1% false positives
+        false_positives = sum(key in bloom for key in random_strs(1, 1000, 30) if key not in set(keys))
+        assert(false_positives < 50)
+
+    def test_add_returns_presence(self):
+        bloom = BloomFilter(100)
+        assert(not bloom.add('CATG'))
+        assert(bloom.add('CATG'))
+
+    def test_merge(self):
+        a, b = BloomFilter(100), BloomFilter(100)
+        a.add('CATG')
+        b.add('TTAG')
+        a.merge(b)
+        assert('CATG' in a and 'TTAG' in a)
+
+
+class TestGenerationIndex:
+
+    def test_counts(self):
+        strs = random_strs(2, 5000, 6)
+        expected = Counter(strs)
+        for packed in [True, False]:
+            index = GenerationIndex(packed=packed)
+            index.update(strs)
+            assert(len(index) == len(expected))
+            assert(index.total == 5000)
+            assert(dict(index.items()) == expected)
+            assert(set(index.strands()) == set(Strand._create(s) for s in expected))
+            assert(index.count('') == expected[''] and '' in index)
+            assert(index.most_common(1)[0][1] == expected.most_common(1)[0][1])
+
+    def test_packed_is_smaller(self):
+        strs = random_strs(3, 1000, 200)
+        packed, plain = GenerationIndex(), GenerationIndex(packed=False)
+        packed.update(strs)
+        plain.update(strs)
+        assert(packed.nbytes() < plain.nbytes())
+
+    def test_bloom_drops_singletons(self):
+        strs = ['CATG'] * 3 + ['TTAG'] + ['GGAC'] * 2
+        index = GenerationIndex(bloom=BloomFilter(100))
+        index.update(strs)
+        assert(dict(index.items()) == {'CATG': 3, 'GGAC': 2})
+        assert(index.total == 6)
+
+    def test_merge(self):
+        strs = random_strs(4, 3000, 5)
+        parts = [GenerationIndex(packed=idx % 2 == 0) for idx in range(3)]
+        for idx, s in enumerate(strs):
+            parts[idx % 3].add(s)
+        merged = GenerationIndex()
+        for part in parts:
+            merged.merge(pickle.loads(pickle.dumps(part, 2)))
+        assert(dict(merged.items()) == Counter(strs))
+        assert(merged.total == 3000)
+
+    def test_merge_bloom(self):
+        a, b, c = GenerationIndex(bloom=BloomFilter(100)), GenerationIndex(), GenerationIndex()
+        a.update(['CATG', 'TTAG', 'TTAG', 'GGAC'])
+        b.update(['CATG', 'GGAC', 'GGAC', 'AAAA'])
+        c.update(['AAAA', 'CCCC'])
+        a.merge(b).merge(c)
+        # the same as adding every copy to a
+        assert(dict(a.items()) == {'CATG': 2, 'TTAG': 2, 'GGAC': 3, 'AAAA': 2})
+        assert(a.total == 10)
+        assert_raises(ValueError, b.merge, GenerationIndex(bloom=BloomFilter(100)))
+
+def test_index_generation():
+    population = [Strand(s) for s in random_strs(5, 300, 20)]
+    expected = Counter(d for strand in population for d in cycle_str(strand.strand))
+    assert(dict(index_generation(population, chunk_size=50).items()) == expected)
+
+    pool = multiprocessing.Pool(2)
+    try:
+        index = index_generation(population, pool, chunk_size=50)
+    finally:
+        pool.terminate()
+    assert(dict(index.items()) == expected)
+
+    repeated = dict((s, count) for s, count in expected.items() if count > 1)
+    for chunk_size in [1000, 50, 10]:
+        index = index_generation(population, chunk_size=chunk_size, bloom_capacity=10000)
+        assert(dict(index.items()) == repeated)
+        assert(index.total == sum(expected.values()))
@@ -1,10 +1,13 @@
-from typogenetics.enzyme import Enzyme, InvalidEnzyme
+from typogenetics.enzyme import Enzyme, InvalidEnzyme, binding_preference, opcodes_binding_preference
+from typogenetics.enzyme import ABSOLUTE_TO_BINDING, ENZYME_TO_RELATIVE, RELATIVE_TRANSFORMATIONS
 from typogenetics.strand import Strand
 from typogenetics.ribosomes import strand_to_enzymes
-from typogenetics.amino_acid import AminoAcid
+from typogenetics.amino_acid import AminoAcid, OPCODES
 
 from nose.tools import assert_raises_regexp
 
+import itertools
+
 class TestEnzyme:
 
     def test_constructor(self):
@@ -28,3 +31,24 @@ class TestEnzyme:
         e = strand_to_enzymes(s)
         e0 = e[0]
         assert(e0.binding_preference == 'T')
+
+    def test_equality(self):
+        e1 = Enzyme([AminoAcid('cut'), AminoAcid('delete')])
+        e2 = Enzyme([AminoAcid('cut'), AminoAcid('delete')])
+        assert(e1 == e2)
+        assert(e1 != Enzyme([AminoAcid('cut')]))
+        assert(len(set([e1, e2])) == 1)
+        assert(e1.amino_acids == (AminoAcid('cut'), AminoAcid('delete')))
+
+    def test_binding_preference_table(self):
+        # compare against stepping through the fold directions, for all of the
+        # enzymes up to length 4
+        folding_ops = sorted(ENZYME_TO_RELATIVE)
+        for length in range(5):
+            for ops in itertools.product(folding_ops, repeat=length):
+                direction = 'R'
+                for op in ops[1:-1]:
+                    direction = RELATIVE_TRANSFORMATIONS[direction][ENZYME_TO_RELATIVE[op]]
+                amino_acids = [AminoAcid(op) for op in ops]
+                assert(binding_preference(amino_acids) == ABSOLUTE_TO_BINDING[direction])
+                assert(opcodes_binding_preference(''.join(OPCODES[op] for op in ops)) == ABSOLUTE_TO_BINDING[direction])
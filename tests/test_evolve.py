@@ -0,0 +1,35 @@
+from typogenetics.evolve import cycle, cycle_str, next_generation, evolve
+from typogenetics.strand import Strand
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import apply_enzyme
+
+class TestEvolve:
+
+    def test_cycle(self):
+        s = Strand('TAGATCCAGTCCACTCGA')
+        daughters = []
+        for enzyme in strand_to_enzymes(s):
+            daughters.extend(apply_enzyme(s, enzyme))
+        assert([d.strand for d in cycle(s)] == [d.strand for d in daughters])
+        assert(cycle_str(s.strand) == [d.strand for d in daughters])
+
+    def test_deduplication(self):
+        s = Strand('TAGATCCAGTCCACTCGA')
+        population = next_generation([s, s, s])
+        strand_strs = [strand.strand for strand in population]
+        assert(strand_strs == [d.strand for d in next_generation([s])])
+        assert(len(strand_strs) == len(set(strand_strs)))
+
+    def test_population_cap(self):
+        population = [Strand('TAGATCCAGTCCACTCGA'), Strand('CGGATACTAAACCGA'), Strand('CAAAGAGAATCCTCTTTGAT')]
+        for generation, next_population in evolve(population, 3, processes=1, population_cap=2, seed=0):
+            assert(len(next_population) <= 2)
+
+    def test_independent_of_processes(self):
+        population = [Strand('TAGATCCAGTCCACTCGA'), Strand('CGGATACTAAACCGA'), Strand('CAAAGAGAATCCTCTTTGAT'),
+                      Strand('TCCGCAATTT'), Strand('CGTCATCTACTGGTTAGC')]
+        serial = [[s.strand for s in p] for g, p in evolve(population, 4, processes=1, chunk_size=2,
+                                                           population_cap=10, seed=1)]
+        parallel = [[s.strand for s in p] for g, p in evolve(population, 4, processes=2, chunk_size=2,
+                                                             population_cap=10, seed=1)]
+        assert(serial == parallel)
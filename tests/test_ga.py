@@ -0,0 +1,89 @@
+from typogenetics.ga import GeneticAlgorithm, Fitness, DaughterCount, LengthGrowth, TargetSimilarity, WeightedSum
+from typogenetics.ga import point_mutation, indel_mutation, one_point_crossover, two_point_crossover
+from typogenetics.ga import tournament_selection, roulette_selection, truncation_selection
+from typogenetics.strand import Strand
+from typogenetics.evolve import cycle_str
+
+import random
+
+class StrandLength(Fitness):
+
+    def score(self, strand_str):
+        return float(len(strand_str))
+
+
+class TestOperators:
+
+    def test_point_mutation(self):
+        rng = random.Random(0)
+        assert(point_mutation('CATG', 0.0, rng) == 'CATG')
+        mutated = point_mutation('CATG', 1.0, rng)
+        assert(len(mutated) == 4 and all(a != b for a, b in zip(mutated, 'CATG')))
+
+    def test_indel_mutation(self):
+        rng = random.Random(0)
+        assert(indel_mutation('CATG', 0.0, rng) == 'CATG')
+        for _ in range(100):
+            mutated = indel_mutation('CATG', 0.3, rng)
+            assert(mutated and set(mutated) <= set('ACGT'))
+        assert(len(indel_mutation('A', 0.5, random.Random(1))) >= 1)
+
+    def test_crossover(self):
+        rng = random.Random(0)
+        for crossover in [one_point_crossover, two_point_crossover]:
+            for _ in range(50):
+                a, b = crossover('AAAAAA', 'TTTTTTTT', rng)
+                assert(sorted([len(a), len(b)]) == [6, 8])
+                assert(a.count('A') + b.count('A') == 6 and 'A' in b and 'T' in a)
+        assert(one_point_crossover('A', 'TT', rng) == ('A', 'TT'))
+
+    def test_selection(self):
+        rng = random.Random(0)
+        strs, fitnesses = ['A', 'C', 'G', 'T'], [0.0, 1.0, 2.0, 3.0]
+        assert(tournament_selection(strs, fitnesses, 5, rng, size=4) == ['T'] * 5)
+        assert('A' not in roulette_selection(strs, fitnesses, 100, rng))
+        assert(set(truncation_selection(strs, fitnesses, 100, rng)) == set(['G', 'T']))
+        assert(len(roulette_selection(strs, [1.0] * 4, 10, rng)) == 10)
+
+
+class TestFitness:
+
+    def test_objectives(self):
+        s = 'TAGATCCAGTCCACATCGA'
+        daughters = cycle_str(s)
+        assert(DaughterCount().score(s) == len(daughters))
+        assert(LengthGrowth().score(s) == sum(len(d) for d in daughters) / float(len(s)))
+        assert(LengthGrowth().score('') == 0.0)
+        assert(TargetSimilarity(s, daughters=False).score(s) == 1.0)
+        assert(0 < TargetSimilarity(Strand(s)).score(s) <= 1.0)
+        combined = WeightedSum([(2.0, DaughterCount()), (-1.0, StrandLength())])
+        assert(combined.score(s) == 2.0 * len(daughters) - len(s))
+
+
+class TestGeneticAlgorithm:
+
+    def test_cache(self):
+        ga = GeneticAlgorithm(StrandLength(), processes=1)
+        assert(ga.evaluate(['CATG', 'CA', 'CATG']) == [4.0, 2.0, 4.0])
+        assert(ga.cache.misses == 2)
+        assert(ga.evaluate(['CA']) == [2.0])
+        assert(ga.cache.hits == 1)
+        assert(ga.best == (4.0, 'CATG'))
+
+    def test_improves(self):
+        ga = GeneticAlgorithm(StrandLength(), population_size=30, indel_rate=0.1, processes=1, seed=0)
+        best = []
+        for generation, population, fitnesses in ga.run([Strand('CATG')] * 30, 15):
+            assert(len(population) == 30 and len(fitnesses) == 30)
+            best.append(max(fitnesses))
+        # elitism never loses the fittest strand
+        assert(best == sorted(best) and best[-1] > 4.0)
+
+    def test_parallel_matches_serial(self):
+        def run(processes):
+            ga = GeneticAlgorithm(TargetSimilarity('TAGATCCAGTCCACATCGA'), population_size=20,
+                                  processes=processes, chunk_size=4, seed=3)
+            return [(generation, population, fitnesses)
+                    for generation, population, fitnesses in ga.run([Strand('CATGCATG')] * 20, 3)]
+
+        assert(run(1) == run(2))
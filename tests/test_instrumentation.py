@@ -0,0 +1,71 @@
+from typogenetics.instrumentation import Observer, OpStats
+from typogenetics.manipulation import apply_enzyme, apply_enzyme_batch, CompiledEnzyme
+from typogenetics.manipulation import StrandManipulationBuffer, ArrayStrandManipulationBuffer
+from typogenetics.strand import Strand
+from typogenetics.enzyme import Enzyme
+from typogenetics.amino_acid import AminoAcid, AMINO_ACIDS
+
+import json
+import random
+
+class TestInstrumentation:
+
+    def test_counters(self):
+        s = Strand('ACGTTTAAGC')
+        e = Enzyme([AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('rpy'), AminoAcid('cop'), AminoAcid('swi'),
+                    AminoAcid('lpu'), AminoAcid('mvl'), AminoAcid('mvl')])
+        for buffer_class in [StrandManipulationBuffer, ArrayStrandManipulationBuffer]:
+            stats = OpStats()
+            final_strands = apply_enzyme(s, e, buffer_class=buffer_class, observer=stats)
+            apply_enzyme(Strand('GGG'), e, observer=stats)
+
+            assert(stats.ops == {'mvr': 2, 'rpy': 1, 'cop': 1, 'swi': 1, 'lpu': 1})
+            assert(stats.bases_moved == 6)  # binds to the T, 2 moves then 4 to the last C
+            assert(stats.out_of_strand == 1)  # the lpu runs off the strand
+            assert(stats.binding_failures == 1)
+            assert(stats.applications == 1)
+            assert(stats.daughters == len(final_strands))
+            assert(set(stats.op_nanoseconds) == set(stats.ops))
+
+    def test_compiled_runs(self):
+        s = Strand('ACGTACGT')
+        e = Enzyme([AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr')])
+        stats = OpStats()
+        apply_enzyme(s, CompiledEnzyme(e, ArrayStrandManipulationBuffer), observer=stats)
+        assert(stats.ops == {'mvr': 3})
+        assert(stats.bases_moved == 3)
+
+        # a run cut short counts the moves executed, the same on every path
+        e = Enzyme([AminoAcid('mvr')] * 5)
+        for enzyme in [e, CompiledEnzyme(e, ArrayStrandManipulationBuffer)]:
+            stats = OpStats()
+            apply_enzyme(Strand('AC'), enzyme, buffer_class=ArrayStrandManipulationBuffer, observer=stats)
+            assert(stats.ops == {'mvr': 2})
+            stats = OpStats()
+            apply_enzyme_batch([Strand('AC')], e, observer=stats)
+            assert(stats.ops == {'mvr': 2})
+
+    def test_same_results(self):
+        rng = random.Random(4)
+        stats = OpStats()
+        for i in range(500):
+            s = Strand(''.join(rng.choice('ACGT') for _ in range(rng.randint(0, 20))))
+            e = Enzyme([AminoAcid(rng.choice(AMINO_ACIDS[1:])) for _ in range(rng.randint(0, 12))])
+            assert(apply_enzyme(s, e, observer=stats) == apply_enzyme(s, e))
+            assert(apply_enzyme_batch([s], e, observer=Observer()) == [apply_enzyme(s, e)])
+        assert(stats.applications + stats.binding_failures == 500)
+
+    def test_export(self):
+        stats = OpStats()
+        apply_enzyme(Strand('ACGT'), Enzyme([AminoAcid('mvr'), AminoAcid('cut')]), observer=stats)
+        other = OpStats()
+        apply_enzyme(Strand('TTT'), Enzyme([AminoAcid('cut')]), observer=other)
+        stats.merge(other)
+
+        exported = json.loads(stats.to_json())
+        assert(exported['ops'] == {'mvr': 1, 'cut': 1})
+        assert(exported['binding_failures'] == 1)
+        text = stats.to_prometheus()
+        assert('typogenetics_ops_total{op="mvr"} 1\n' in text)
+        assert('# TYPE typogenetics_bases_moved_total counter\n' in text)
+        assert('typogenetics_binding_failures_total 1\n' in text)
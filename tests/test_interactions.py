@@ -0,0 +1,53 @@
+from typogenetics.interactions import population_enzymes, interactions, write_interactions, read_interactions
+from typogenetics.strand import Strand
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import apply_enzyme
+
+import os
+import random
+import shutil
+import tempfile
+
+def random_population(seed, count):
+    rng = random.Random(seed)
+    return [Strand(''.join(rng.choice('ACGT') for _ in range(rng.randint(2, 24)))) for _ in range(count)]
+
+def expected_cells(enzymes, strands):
+    cells = {}
+    for i, enzyme in enumerate(enzymes):
+        for j, strand in enumerate(strands):
+            if enzyme.binding_preference in strand.strand:
+                cells[i, j] = tuple(s.strand for s in apply_enzyme(strand, enzyme))
+    return cells
+
+class TestInteractions:
+
+    def setup(self):
+        self.strands = random_population(0, 40)
+        self.enzymes, self.producers = population_enzymes(self.strands)
+        self.expected = expected_cells(self.enzymes, self.strands)
+
+    def test_population_enzymes(self):
+        assert(len(self.enzymes) == sum(len(strand_to_enzymes(s)) for s in self.strands))
+        assert(all(self.enzymes[i] in strand_to_enzymes(self.strands[p]) for i, p in enumerate(self.producers)))
+
+    def test_matches_apply_enzyme(self):
+        cells = list(interactions(self.enzymes, self.strands, processes=1, enzyme_tile_size=7, strand_tile_size=9))
+        assert(dict(((i, j), d) for i, j, d in cells) == self.expected)
+        assert(len(cells) == len(self.expected))
+
+    def test_parallel(self):
+        serial = list(interactions(self.enzymes, self.strands, processes=1, enzyme_tile_size=7, strand_tile_size=9))
+        parallel = list(interactions(self.enzymes, self.strands, processes=2, enzyme_tile_size=7, strand_tile_size=9))
+        assert(serial == parallel)
+
+    def test_write_read(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'matrix.tsv.gz')
+            count = write_interactions(path, self.enzymes, self.strands, processes=1)
+            cells = list(read_interactions(path))
+            assert(count == len(cells))
+            assert(dict(((i, j), d) for i, j, d in cells) == self.expected)
+        finally:
+            shutil.rmtree(tmp_dir)
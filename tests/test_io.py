@@ -0,0 +1,80 @@
+from typogenetics.io import read_records, read_strands, write_records, cycle_records, run_cycle, open_file
+from typogenetics.strand import Strand, InvalidStrand
+from typogenetics.__main__ import main
+from typogenetics.evolve import cycle
+
+from nose.tools import assert_raises, assert_raises_regexp
+
+from StringIO import StringIO
+
+import os
+import shutil
+import tempfile
+
+class TestIO:
+
+    def test_read_lines(self):
+        f = StringIO('TAGATCCAGTCCACTCGA\n\n# comment\ncggatactaaaccga\r\n')
+        records = list(read_records(f))
+        assert(records == [('1', Strand('TAGATCCAGTCCACTCGA')), ('2', Strand('CGGATACTAAACCGA'))])
+
+    def test_read_fasta(self):
+        f = StringIO('>first strand\nTAGATCC\nAGTCCACTCGA\n;comment\n>\nCGGATACTAAACCGA\n')
+        records = list(read_records(f))
+        assert(records == [('first strand', Strand('TAGATCCAGTCCACTCGA')), ('2', Strand('CGGATACTAAACCGA'))])
+        assert(list(read_strands(StringIO('ACGT\n'))) == [Strand('ACGT')])
+
+    def test_read_invalid(self):
+        records = read_records(StringIO('ACGT\n# comment\nACXT\n'))
+        assert(next(records) == ('1', Strand('ACGT')))
+        with assert_raises_regexp(InvalidStrand, 'Record 2 on line 3: Strand contains an invalid base unit'):
+            next(records)
+        with assert_raises_regexp(InvalidStrand, 'Record bad on line 3'):
+            list(read_records(StringIO('>good\nACGT\n>bad\nAC\nGU\n')))
+
+    def test_write(self):
+        records = [('a', Strand('ACGT')), ('b', Strand('TT'))]
+        f = StringIO()
+        assert(write_records(records, f) == 2)
+        assert(f.getvalue() == 'ACGT\nTT\n')
+        f = StringIO()
+        write_records(records, f, fasta=True)
+        assert(f.getvalue() == '>a\nACGT\n>b\nTT\n')
+
+    def test_cycle_records(self):
+        s = Strand('TAGATCCAGTCCACTCGA')
+        daughters = list(cycle_records([('x', s)]))
+        assert([name for name, d in daughters] == ['x.%d' % (i + 1) for i in range(len(cycle(s)))])
+        assert([d for name, d in daughters] == cycle(s))
+
+    def test_run_cycle_gzip(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            input_path = os.path.join(tmp, 'in.txt.gz')
+            output_path = os.path.join(tmp, 'out.txt.gz')
+            f = open_file(input_path, 'w')
+            f.write('TAGATCCAGTCCACTCGA\nCGGATACTAAACCGA\n')
+            f.close()
+
+            stats = run_cycle(input_path, output_path)
+            assert(stats['strands'] == 2 and stats['bases'] == 33)
+
+            f = open_file(output_path, 'r')
+            daughters = list(read_strands(f))
+            f.close()
+            assert(daughters == cycle(Strand('TAGATCCAGTCCACTCGA')) + cycle(Strand('CGGATACTAAACCGA')))
+            assert(stats['daughters'] == len(daughters))
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_main_invalid_input(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            input_path = os.path.join(tmp, 'in.txt')
+            with open(input_path, 'w') as f:
+                f.write('ACGT\nACXT\n')
+            with assert_raises(SystemExit) as context:
+                main([input_path, '-o', os.path.join(tmp, 'out.txt')])
+            assert(context.exception.code == 1)
+        finally:
+            shutil.rmtree(tmp)
@@ -0,0 +1,68 @@
+from typogenetics.lineage import LineageRecorder, NONE
+from typogenetics.evolve import evolve, next_generation, cycle_str_by_enzyme, cycle_str
+from typogenetics.strand import Strand
+from typogenetics.ribosomes import strand_to_enzymes
+
+import os
+import shutil
+import tempfile
+
+POPULATION = [Strand('TAGATCCAGTCCACTCGA'), Strand('CGGATACTAAACCGA'), Strand('CAAAGAGAATCCTCTTTGAT')]
+
+class TestLineage:
+
+    def test_add_and_ancestors(self):
+        lineage = LineageRecorder()
+        root = lineage.add('CATG')
+        child = lineage.add('CAT', root, ('cut',), 1)
+        grandchild = lineage.add('CATG', child, ('ina', 'mvr'), 2)
+        assert(lineage.ancestors(grandchild) == [grandchild, child, root])
+        assert(lineage.records_of('CATG') == [root, grandchild])
+        assert(lineage.enzyme_of(child) == ('cut',) and lineage.enzyme_of(root) is None)
+        assert(lineage.parent[root] == NONE)
+        assert(lineage.common_ancestor(grandchild, lineage.add('TTT', child, ('cut',), 2)) == child)
+        # sequences are interned
+        assert(lineage.sequences == ['CATG', 'CAT', 'TTT'])
+
+    def test_cycle_str_by_enzyme(self):
+        s = 'TAGATCCAGTCCACTCGA'
+        by_enzyme = cycle_str_by_enzyme(s)
+        assert([ops for ops, daughters in by_enzyme] ==
+               [tuple(aa.op for aa in e.amino_acids) for e in strand_to_enzymes(Strand(s))])
+        assert([d for ops, daughters in by_enzyme for d in daughters] == cycle_str(s))
+
+    def test_evolve(self):
+        lineage = LineageRecorder()
+        recorded = list(evolve(POPULATION, 4, processes=1, population_cap=20, seed=0, lineage=lineage))
+        plain = list(evolve(POPULATION, 4, processes=1, population_cap=20, seed=0))
+        assert(recorded == plain)
+        assert(lineage.current_generation == 4)
+
+        for generation, population in recorded:
+            for strand in population:
+                record = [r for r in lineage.records_of(strand.strand) if lineage.generation_of(r) == generation][0]
+                ancestors = lineage.ancestors(record)
+                assert([lineage.generation_of(r) for r in ancestors] == range(generation, -1, -1))
+                assert(lineage.sequence_of(ancestors[-1]) in [s.strand for s in POPULATION])
+                # every daughter is made by its parent's enzyme
+                parent_str = lineage.sequence_of(ancestors[1])
+                assert(strand.strand in dict(cycle_str_by_enzyme(parent_str))[lineage.enzyme_of(record)])
+
+    def test_save_load(self):
+        lineage = LineageRecorder()
+        population = POPULATION
+        for _ in range(3):
+            population = next_generation(population, lineage=lineage)
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'lineage')
+            lineage.save(path)
+            loaded = LineageRecorder.load(path)
+        finally:
+            shutil.rmtree(tmp_dir)
+        for name in ['sequence', 'parent', 'enzyme', 'generation', 'sequences', 'enzymes']:
+            assert(getattr(loaded, name) == getattr(lineage, name))
+        # recording carries on from the last generation
+        next_generation(population, lineage=lineage)
+        next_generation(population, lineage=loaded)
+        assert(loaded.parent == lineage.parent and loaded.sequence == lineage.sequence)
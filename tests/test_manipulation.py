@@ -1,8 +1,15 @@
 from typogenetics.enzyme import Enzyme, InvalidEnzyme
 from typogenetics.strand import Strand
 from typogenetics.ribosomes import strand_to_enzymes
-from typogenetics.manipulation import apply_enzyme
-from typogenetics.amino_acid import AminoAcid
+from typogenetics.manipulation import apply_enzyme, ArrayStrandManipulationBuffer, StrandManipulationBuffer, CompiledEnzyme
+from typogenetics.manipulation import apply_enzyme_batch, find_binding_sites, apply_enzyme_to_str
+from typogenetics.manipulation import StatusArrayStrandManipulationBuffer, find_nearest
+from typogenetics.manipulation import OutOfStrandException, OUT_OF_STRAND
+from typogenetics.amino_acid import AminoAcid, AMINO_ACIDS
+
+from nose.tools import assert_raises
+
+import random
 
 class TestManipulation:
 
@@ -402,3 +409,182 @@ class TestManipulation:
         final_strands = apply_enzyme(s, e)
         strand_strs = sorted([strand.strand for strand in final_strands])
         assert(strand_strs == ['ACGTGGGGGG', 'CCCC', 'GG'])
+
+
+class TestArrayManipulation:
+
+    def test_book_example(self):
+        s = Strand('TAGATCCAGTCCATCGA')
+        e = Enzyme([AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr'),
+                    AminoAcid('mvr'), AminoAcid('mvr'),
+                    AminoAcid('rpu'), AminoAcid('inc'), AminoAcid('cop'), AminoAcid('mvr'),
+                    AminoAcid('mvl'), AminoAcid('swi'), AminoAcid('lpu'), AminoAcid('int')])
+
+        final_strands = apply_enzyme(s, e, buffer_class=ArrayStrandManipulationBuffer)
+        strand_strs = sorted([strand.strand for strand in final_strands])
+        assert(strand_strs == ['ATG', 'TAGATCCAGTCCACATCGA'])
+
+    def test_empty_strand(self):
+        s = Strand('')
+        e = Enzyme([AminoAcid('delete')])
+        final_strands = apply_enzyme(s, e, buffer_class=ArrayStrandManipulationBuffer)
+        assert(final_strands[0] == s)
+
+    def test_swi_cut(self):
+        s = Strand('ACGTACGT')
+        e = Enzyme([AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('cop'), AminoAcid('mvr'), AminoAcid('swi'),
+                    AminoAcid('cut'), AminoAcid('mvr'), AminoAcid('ina')])
+
+        final_strands = apply_enzyme(s, e, buffer_class=ArrayStrandManipulationBuffer)
+        strand_strs = [strand.strand for strand in final_strands]
+        assert(strand_strs == [strand.strand for strand in apply_enzyme(s, e)])
+
+    def test_matches_deque_buffer(self):
+        rng = random.Random(0)
+        for i in range(2000):
+            s = Strand(''.join(rng.choice('ACGT') for _ in range(rng.randint(0, 20))))
+            e = Enzyme([AminoAcid(rng.choice(AMINO_ACIDS[1:])) for _ in range(rng.randint(0, 12))])
+
+            expected = [strand.strand for strand in apply_enzyme(s, e)]
+            final_strands = apply_enzyme(s, e, buffer_class=ArrayStrandManipulationBuffer)
+            assert([strand.strand for strand in final_strands] == expected)
+
+
+class TestCompiledEnzyme:
+
+    def test_merged_moves(self):
+        e = Enzyme([AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('cop'),
+                    AminoAcid('mvl'), AminoAcid('mvl'), AminoAcid('mvr')])
+        compiled = CompiledEnzyme(e)
+        labels = [label for label, operation, args in compiled.program]
+        assert(labels == ['mvr-mvr-mvr', 'cop', 'mvl-mvl', 'mvr'])
+        assert(compiled.program[0][2] == (3,))
+        assert(compiled.binding_preference == e.binding_preference)
+
+    def test_book_example(self):
+        s = Strand('TAGATCCAGTCCATCGA')
+        e = Enzyme([AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr'),
+                    AminoAcid('mvr'), AminoAcid('mvr'),
+                    AminoAcid('rpu'), AminoAcid('inc'), AminoAcid('cop'), AminoAcid('mvr'),
+                    AminoAcid('mvl'), AminoAcid('swi'), AminoAcid('lpu'), AminoAcid('int')])
+
+        for buffer_class in [StrandManipulationBuffer, ArrayStrandManipulationBuffer]:
+            final_strands = apply_enzyme(s, CompiledEnzyme(e, buffer_class))
+            strand_strs = sorted([strand.strand for strand in final_strands])
+            assert(strand_strs == ['ATG', 'TAGATCCAGTCCACATCGA'])
+
+    def test_moves_into_gap(self):
+        s = Strand('ACGTGGGGGGGGG')
+        e = Enzyme([AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr'),
+                    AminoAcid('mvr'), AminoAcid('cop'), AminoAcid('mvr'), AminoAcid('mvr'), AminoAcid('mvr'),
+                    AminoAcid('mvl'), AminoAcid('delete'), AminoAcid('mvl'), AminoAcid('mvl'), AminoAcid('mvl')])
+
+        expected = [strand.strand for strand in apply_enzyme(s, e)]
+        for buffer_class in [StrandManipulationBuffer, ArrayStrandManipulationBuffer]:
+            final_strands = apply_enzyme(s, CompiledEnzyme(e, buffer_class))
+            assert([strand.strand for strand in final_strands] == expected)
+
+    def test_matches_uncompiled(self):
+        rng = random.Random(1)
+        ops = AMINO_ACIDS[1:] + ['mvr', 'mvl'] * 4
+        for i in range(2000):
+            s = Strand(''.join(rng.choice('ACGT') for _ in range(rng.randint(0, 20))))
+            e = Enzyme([AminoAcid(rng.choice(ops)) for _ in range(rng.randint(0, 12))])
+
+            expected = [strand.strand for strand in apply_enzyme(s, e)]
+            final_strands = apply_enzyme(s, CompiledEnzyme(e, ArrayStrandManipulationBuffer))
+            assert([strand.strand for strand in final_strands] == expected)
+
+
+class TestBatch:
+
+    def test_binding_sites(self):
+        strands = [Strand('ACGT'), Strand('GGG'), Strand(''), Strand('TTAC')]
+        assert(find_binding_sites(strands, 'C') == [1, -1, -1, 3])
+
+    def test_apply_enzyme_batch(self):
+        strands = [Strand('CAAAGAGAATCCTCTTTGAT'), Strand('GGG'), Strand('ACGT')]
+        e = Enzyme([AminoAcid('rpy'), AminoAcid('cop'), AminoAcid('rpu'), AminoAcid('cut')])
+
+        for buffer_class in [StrandManipulationBuffer, ArrayStrandManipulationBuffer]:
+            results = apply_enzyme_batch(strands, e, buffer_class)
+            assert(len(results) == 3)
+            assert(sorted([strand.strand for strand in results[0]]) == ['AT', 'CAAAGAGAATCCTCTTTG', 'CAAAGAGGA'])
+            assert(results[1][0] == strands[1])
+            for strand, daughters in zip(strands, results):
+                assert([d.strand for d in daughters] == [d.strand for d in apply_enzyme(strand, e)])
+
+
+class TestApplyEnzymeToStr:
+
+    def test_daughter_strs(self):
+        e = Enzyme([AminoAcid('rpy'), AminoAcid('cop'), AminoAcid('rpu'), AminoAcid('cut')])
+        daughter_strs = apply_enzyme_to_str('CAAAGAGAATCCTCTTTGAT', e)
+        assert(daughter_strs == ['AT', 'CAAAGAGAATCCTCTTTG', 'CAAAGAGGA'])
+
+    def test_no_binding(self):
+        e = Enzyme([AminoAcid('rpy'), AminoAcid('cop')])
+        assert(apply_enzyme_to_str('', e) is None)
+        assert(apply_enzyme_to_str('GGG', Enzyme([AminoAcid('cut')])) is None)
+
+    def test_secondary_order(self):
+        # several gapped pieces on the upper strand
+        s = Strand('ACGTGGGG')
+        e = Enzyme([AminoAcid('cop'), AminoAcid('mvr'), AminoAcid('off'), AminoAcid('mvr'), AminoAcid('mvr'),
+                    AminoAcid('cop'), AminoAcid('mvr')])
+        for buffer_class in [StrandManipulationBuffer, ArrayStrandManipulationBuffer]:
+            final_strands = apply_enzyme(s, e, buffer_class=buffer_class)
+            assert([strand.strand for strand in final_strands] == ['ACGTGGGG', 'GT', 'CA'])
+
+
+class TestScans:
+
+    def test_find_nearest(self):
+        data = bytearray('A' * 500 + 'C' + 'A' * 10 + '.' + 'T')
+        assert(find_nearest(data, 0, 1, 'CT.') == 500)
+        assert(find_nearest(data, 500, 1, 'CT.') == 511)
+        assert(find_nearest(data, 511, 1, 'CT.') == 512)
+        assert(find_nearest(data, 512, 1, 'CT.') == -1)
+        assert(find_nearest(data, 512, -1, 'CT.') == 511)
+        assert(find_nearest(data, 500, -1, 'CT.') == -1)
+        assert(find_nearest(data, 510, -1, 'G') == -1)
+
+    def test_long_runs(self):
+        s = Strand('C' + 'A' * 1000 + 'T' + 'G' * 300 + 'C')
+        for ops in [['rpy', 'cop', 'lpy', 'swi', 'lpu', 'rpu'], ['cop', 'rpy', 'rpy', 'rpy', 'ina', 'lpy', 'cut'],
+                    ['mvr', 'delete', 'rpy', 'cop', 'lpu', 'lpu']]:
+            e = Enzyme([AminoAcid(op) for op in ops])
+            expected = [strand.strand for strand in apply_enzyme(s, e)]
+            for buffer_class in [ArrayStrandManipulationBuffer]:
+                final_strands = apply_enzyme(s, e, buffer_class=buffer_class)
+                assert([strand.strand for strand in final_strands] == expected)
+
+
+class TestStatusManipulation:
+
+    def test_returns_status(self):
+        sm = StatusArrayStrandManipulationBuffer('CAT')
+        sm.seek(1)
+        assert(sm.mvr() is None)
+        assert(sm.mvr() is OUT_OF_STRAND)
+        assert(sm.swi() is OUT_OF_STRAND)
+        sm.seek(1)
+        assert(sm.rpu() is OUT_OF_STRAND)
+        assert(sm.cursor() == 2)
+
+    def test_raising_buffer(self):
+        sm = ArrayStrandManipulationBuffer('CAT')
+        sm.seek(2)
+        with assert_raises(OutOfStrandException):
+            sm.mvr()
+
+    def test_matches_deque_buffer(self):
+        rng = random.Random(3)
+        ops = AMINO_ACIDS[1:] + ['cop', 'rpy', 'rpu', 'lpy', 'lpu']
+        for i in range(2000):
+            s = Strand(''.join(rng.choice('ACGT') for _ in range(rng.randint(0, 20))))
+            e = Enzyme([AminoAcid(rng.choice(ops)) for _ in range(rng.randint(0, 12))])
+
+            expected = [strand.strand for strand in apply_enzyme(s, e)]
+            final_strands = apply_enzyme(s, CompiledEnzyme(e, StatusArrayStrandManipulationBuffer))
+            assert([strand.strand for strand in final_strands] == expected)
@@ -0,0 +1,40 @@
+from typogenetics.packed import PackedStrand, pack, unpack, complement, reverse_complement
+from typogenetics.strand import Strand, InvalidStrand
+
+from nose.tools import assert_raises_regexp
+
+import random
+
+class TestPacked:
+
+    def test_pack(self):
+        assert(pack('ACGT') == '\x1b')
+        assert(pack('T') == '\xc0')
+        assert(pack('') == '')
+
+    def test_round_trip(self):
+        rng = random.Random(0)
+        for length in range(20):
+            s = ''.join(rng.choice('ACGT') for _ in range(length))
+            assert(unpack(pack(s), length) == s)
+            assert(PackedStrand.from_str(s.lower()).to_str() == s)
+            assert(len(PackedStrand.from_str(s).data) == (length + 3) // 4)
+
+    def test_invalid(self):
+        with assert_raises_regexp(InvalidStrand, 'Strand contains an invalid base unit'):
+            PackedStrand.from_str('ACGU')
+
+    def test_complement_reverse(self):
+        assert(complement('AACGT') == 'TTGCA')
+        assert(reverse_complement('AACGT') == 'ACGTT')
+        for s in ['', 'A', 'AACGT', 'TAGATCCAGTCCACTCGA', 'ACGTACGT']:
+            packed = PackedStrand.from_str(s)
+            assert(packed.complement().to_str() == complement(s))
+            assert(packed.reverse().to_str() == s[::-1])
+            assert(packed.reverse_complement() == PackedStrand.from_str(reverse_complement(s)))
+
+    def test_equality(self):
+        assert(PackedStrand.from_str('ACG') == PackedStrand.from_strand(Strand('ACG')))
+        assert(PackedStrand.from_str('ACG') != PackedStrand.from_str('ACGA'))
+        assert(PackedStrand.from_str('ACG').complement().complement() == PackedStrand.from_str('ACG'))
+        assert(PackedStrand.from_str('ACG').to_strand() == Strand('ACG'))
@@ -0,0 +1,61 @@
+from typogenetics.random import RandomGenerator, gc_composition
+from typogenetics.strand import Strand
+from typogenetics.enzyme import Enzyme
+from typogenetics.packed import PackedStrand
+from typogenetics import evolve, ga, search
+
+from nose.tools import assert_raises
+
+class TestRandomGenerator:
+
+    def test_reproducible(self):
+        a, b = RandomGenerator(seed=1), RandomGenerator(seed=1)
+        assert(a.strand_strs(100) == b.strand_strs(100))
+        assert(a.enzymes(100) == b.enzymes(100))
+        assert(a.strand_strs(10) != RandomGenerator(seed=2).strand_strs(10))
+
+    def test_streams(self):
+        rng = RandomGenerator(seed=1, lengths=20)
+        streams = [rng.stream(n).strand_strs(50) for n in range(3)]
+        assert(streams[0] == RandomGenerator(seed=1, lengths=20).strand_strs(50))
+        assert(streams[1] == RandomGenerator(seed=1, stream=1, lengths=20).strand_strs(50))
+        assert(len(set(tuple(s) for s in streams)) == 3)
+
+    def test_strands(self):
+        strands = RandomGenerator(seed=0, lengths=(5, 9)).strands(500)
+        assert(all(5 <= len(s.strand) <= 9 for s in strands))
+        # the same as validated strands
+        assert(strands == [Strand(s.strand) for s in strands])
+        assert(set(''.join(s.strand for s in strands)) == set('ACGT'))
+
+    def test_lengths(self):
+        rng = RandomGenerator(seed=0)
+        assert([len(s) for s in rng.strand_strs(5, lengths=7)] == [7] * 5)
+        assert([len(s) for s in rng.strand_strs(5, lengths=lambda r: r.choice([2, 4]))] != [])
+        assert(all(len(s) in (2, 4) for s in rng.strand_strs(50, lengths=lambda r: r.choice([2, 4]))))
+        assert(rng.strand_strs(3, lengths=0) == ['', '', ''])
+
+    def test_composition(self):
+        bases = ''.join(RandomGenerator(seed=0, lengths=1000, composition=gc_composition(0.8)).strand_strs(20))
+        gc = (bases.count('G') + bases.count('C')) / float(len(bases))
+        assert(0.77 < gc < 0.83)
+        assert(set(RandomGenerator(seed=0, composition={'A': 1}).strand_strs(10)[0]) == set('A'))
+        with assert_raises(ValueError):
+            RandomGenerator(composition={'A': -1, 'C': 2})
+
+    def test_packed_strands(self):
+        for composition in [None, gc_composition(0.3)]:
+            packed = RandomGenerator(seed=0, lengths=(0, 30), composition=composition).packed_strands(200)
+            for p in packed:
+                assert(isinstance(p, PackedStrand))
+                assert(p == PackedStrand.from_str(p.to_str()))
+
+    def test_enzymes(self):
+        enzymes = RandomGenerator(seed=0, enzyme_lengths=(1, 4)).enzymes(200)
+        assert(all(isinstance(e, Enzyme) and 1 <= len(e.amino_acids) <= 4 for e in enzymes))
+        assert(all(aa.op != 'pun' for e in enzymes for aa in e.amino_acids))
+        assert(enzymes[0] == Enzyme(list(enzymes[0].amino_acids)))
+
+    def test_stdlib_random_not_shadowed(self):
+        for module in [evolve, ga, search]:
+            assert(module.random.__name__ == 'random')
@@ -1,4 +1,4 @@
-from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.ribosomes import strand_to_enzymes, strand_to_opcodes, OPCODES, PUNCTUATION
 from typogenetics.strand import Strand
 from typogenetics.enzyme import Enzyme
 from typogenetics.amino_acid import AminoAcid
@@ -39,3 +39,14 @@ class TestRibosomes:
 
         e_known = []
         self.assert_enzymes_eq(e, e_known)
+
+    def test_odd_length(self):
+        s = Strand('CGGATACTAAACCGA')
+        e = strand_to_enzymes(s)
+        assert(e == strand_to_enzymes(Strand('CGGATACTAAACCG')))
+        assert([enzyme.binding_preference for enzyme in e] == [enzyme.binding_preference for enzyme in
+                [Enzyme(list(enzyme.amino_acids)) for enzyme in e]])
+
+    def test_opcodes(self):
+        s = Strand('CGAACA')
+        assert(strand_to_opcodes(s) == OPCODES['cop'] + PUNCTUATION + OPCODES['mvr'])
@@ -0,0 +1,76 @@
+from typogenetics.search import search, classify, find_cycle, daughters_of, canonical_key, Hit
+from typogenetics.search import _daughters_cache
+from typogenetics.search import INERT, FIXED_POINT, SELF_REPRODUCER, SELF_PRODUCER, CYCLE
+from typogenetics.evolve import cycle_str
+
+from nose.tools import assert_raises
+
+import json
+import os
+import shutil
+import tempfile
+
+class TestSearch:
+
+    def test_daughters_of(self):
+        s = 'TAGATCCAGTCCACTCGA'
+        daughters, bound = daughters_of(s)
+        assert(list(daughters) == cycle_str(s))
+        assert(bound)
+
+    def test_canonical_key(self):
+        assert(canonical_key(['AC', 'GT', 'AC']) == canonical_key(['GT', 'AC', 'AC']))
+        assert(canonical_key(['AC', 'GT']) != canonical_key(['AC', 'GT', 'AC']))
+
+    def test_classify(self):
+        assert(classify('AA') is None)  # no enzymes
+        assert(classify('GG') == Hit('GG', INERT, 0, 1))  # ing binds to A
+        assert(classify('AT') == Hit('AT', FIXED_POINT, 0, 1))  # swi with nothing to switch to
+        for hit in search(6, processes=1, kinds=[SELF_REPRODUCER, SELF_PRODUCER]):
+            daughters, bound = daughters_of(hit.strand)
+            if hit.kind == SELF_REPRODUCER:
+                assert(daughters.count(hit.strand) >= 2)
+            else:
+                assert(daughters.count(hit.strand) == 1)
+
+    def test_find_cycle(self):
+        start, period = find_cycle('ACA', 8)
+        assert(classify('ACA', generations=8) == Hit('ACA', CYCLE, start, period))
+        assert(classify('ACA') is None)
+
+    def test_parallel(self):
+        serial = search(5, min_length=3, generations=4, processes=1)
+        assert(search(5, min_length=3, generations=4, processes=2) == serial)
+        assert(len(serial) == len(set(hit.strand for hit in serial)))
+        assert(all(3 <= len(hit.strand) <= 5 for hit in serial))
+
+    def test_samples(self):
+        hits = search(12, min_length=8, samples=5000, seed=3, processes=1)
+        assert(hits == search(12, min_length=8, samples=5000, seed=3, processes=1))
+
+    def test_sample_count(self):
+        # every sampled strand is classified once, and they're all different
+        for samples in [10, 4100]:
+            _daughters_cache.clear()
+            search(20, min_length=20, samples=samples, processes=1)
+            assert(len(_daughters_cache) == samples)
+
+    def test_checkpoint(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'search.json')
+            hits = search(7, generations=3, processes=1, checkpoint=path)
+
+            # pretend the search stopped half way through
+            with open(path) as f:
+                saved = json.load(f)
+            saved['done'] = 6  # one unit for each length below 7
+            saved['hits'] = [list(hit) for hit in search(6, generations=3, processes=1)]
+            with open(path, 'w') as f:
+                json.dump(saved, f)
+            assert(search(7, generations=3, processes=1, checkpoint=path) == hits)
+
+            with assert_raises(ValueError):
+                search(8, generations=3, processes=1, checkpoint=path)
+        finally:
+            shutil.rmtree(tmp)
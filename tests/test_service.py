@@ -0,0 +1,134 @@
+from typogenetics.service import TypogeneticsService, ServiceClient, ServiceError, Batcher, request_key
+from typogenetics.strand import Strand
+from typogenetics.enzyme import Enzyme
+from typogenetics.amino_acid import AminoAcid
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import apply_enzyme
+from typogenetics.evolve import cycle_str
+
+from nose.tools import assert_raises_regexp
+
+import json
+import os
+import random
+import shutil
+import socket
+import tempfile
+import threading
+
+class TestService:
+
+    def setup(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'typogenetics.sock')
+        self.service = TypogeneticsService(self.path, processes=1)
+        self.service.start()
+
+    def teardown(self):
+        self.service.shutdown()
+        self.service.close()
+        shutil.rmtree(self.dir)
+
+    def test_methods(self):
+        s = Strand('TAGATCCAGTCCACATCGA')
+        with ServiceClient(self.path) as client:
+            enzymes = client.strand_to_enzymes(s)
+            assert(enzymes == strand_to_enzymes(s))
+            for enzyme in enzymes:
+                assert(client.apply_enzyme(s, enzyme) == apply_enzyme(s, enzyme))
+            e = Enzyme([AminoAcid('rpu'), AminoAcid('cut')])
+            assert(client.apply_enzyme('CATG', ['rpu', 'cut']) == apply_enzyme(Strand('CATG'), e))
+            assert([d.strand for d in client.cycle(s)] == cycle_str(s.strand))
+            # an enzyme that binds and leaves no daughters, unlike one that doesn't bind
+            e = Enzyme([AminoAcid('delete')])
+            assert(client.apply_enzyme('A', ['delete']) == apply_enzyme(Strand('A'), e) == [])
+            assert(client.apply_enzyme('C', ['delete']) == apply_enzyme(Strand('C'), e) == [Strand('C')])
+
+    def test_errors(self):
+        with ServiceClient(self.path) as client:
+            with assert_raises_regexp(ServiceError, 'Strand contains an invalid base unit'):
+                client.cycle('CAXG')
+            with assert_raises_regexp(ServiceError, 'Not a valid amino acid'):
+                client.apply_enzyme('CATG', ['cat'])
+            with assert_raises_regexp(ServiceError, 'Unknown method'):
+                client.submit('evolve', strand='CATG').result()
+            # the connection is still usable
+            assert(client.cycle('CATG') == [Strand('CATG')])
+
+    def test_pipelined_clients(self):
+        rng = random.Random(0)
+        strand_strs = [''.join(rng.choice('ACGT') for _ in range(rng.randint(1, 30))) for _ in range(500)]
+        results = {}
+
+        def run(name):
+            with ServiceClient(self.path) as client:
+                pending = [client.submit('cycle', strand=s) for s in strand_strs]
+                results[name] = [p.result(timeout=60) for p in pending]
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = [cycle_str(s) for s in strand_strs]
+        assert(all(results[name] == expected for name in range(3)))
+        with ServiceClient(self.path) as client:
+            stats = client.stats()
+        assert(stats['requests'] == 1500)
+        # far fewer batches than requests, and the repeats come from the cache
+        assert(stats['batches'] < 1500)
+        assert(stats['cache_size'] <= 500 and stats['cache_hits'] > 0)
+
+    def test_stalled_client(self):
+        # a client that never reads its responses, more of them than fit in the socket buffers
+        rng = random.Random(1)
+        strand_str = ''.join(rng.choice('ACGT') for _ in range(2000))
+        stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stalled.connect(self.path)
+        try:
+            request = json.dumps({'id': 1, 'method': 'cycle', 'params': {'strand': strand_str}}) + '\n'
+            stalled.sendall(request * 300)
+            # the other clients still get their responses
+            with ServiceClient(self.path) as client:
+                assert(client.submit('cycle', strand='CATG').result(timeout=10) == ['CATG'])
+        finally:
+            stalled.close()
+
+    def test_existing_path(self):
+        path = os.path.join(self.dir, 'not_a_socket')
+        with open(path, 'w') as f:
+            f.write('data')
+        with assert_raises_regexp(ServiceError, 'exists and is not a socket'):
+            TypogeneticsService(path, processes=1)
+        assert(os.path.exists(path))
+
+
+class TestBatcher:
+
+    def test_request_key(self):
+        assert(request_key('cycle', {'strand': u'catg'}) == ('cycle', 'CATG'))
+        assert(request_key('apply_enzyme', {'strand': 'CATG', 'enzyme': [u'cut']}) == ('apply_enzyme', 'CATG', ('cut',)))
+        with assert_raises_regexp(ServiceError, 'Missing or invalid params'):
+            request_key('cycle', {})
+
+    def test_backpressure(self):
+        batcher = Batcher(processes=1, queue_size=1, batch_size=1)
+        results = []
+        for s in ['CATG', 'TAGATCCAGTCCACATCGA', 'CATG']:
+            batcher.submit(('cycle', s), lambda result, error: results.append(result))
+        batcher.close()
+        assert(results == [cycle_str('CATG'), cycle_str('TAGATCCAGTCCACATCGA'), cycle_str('CATG')])
+        assert(batcher.stats()['cache_hits'] == 1)
+
+
+def test_tcp_worker_pool():
+    service = TypogeneticsService(('127.0.0.1', 0), processes=2)
+    service.start()
+    try:
+        with ServiceClient(service.address) as client:
+            pending = [client.submit('cycle', strand=s) for s in ['CATG', 'TAGATCCAGTCCACATCGA', 'GGTTAC']]
+            assert([p.result(timeout=60) for p in pending] == [cycle_str(s) for s in ['CATG', 'TAGATCCAGTCCACATCGA', 'GGTTAC']])
+    finally:
+        service.shutdown()
+        service.close()
@@ -0,0 +1,79 @@
+from typogenetics.store import PopulationStore
+from typogenetics.packed import PackedStrand
+from typogenetics.strand import Strand
+
+from nose.tools import assert_raises
+
+import os
+import shutil
+import tempfile
+
+class TestPopulationStore:
+
+    def setup(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'population')
+
+    def teardown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_empty(self):
+        with PopulationStore(self.path) as store:
+            assert(len(store) == 0)
+            assert(store.last_generation() is None)
+            assert(store.generations() == [])
+            with assert_raises(IndexError):
+                store[0]
+
+    def test_append_and_read(self):
+        first = [Strand('TAGATCCAGTCCACTCGA'), Strand(''), Strand('A')]
+        second = [Strand('CGGATACTAAACCGA'), Strand('ACGT')]
+        with PopulationStore(self.path) as store:
+            assert(store.append(first, 0) == 3)
+            assert(store[0] == first[0])
+            assert(store.append(second, 1) == 2)
+            assert(list(store) == first + second)
+            assert(store[-1] == Strand('ACGT'))
+            assert(store.packed(0) == PackedStrand.from_str('TAGATCCAGTCCACTCGA'))
+            # a view of the mapped file rather than a copy
+            packed = store.packed(0)
+            assert(isinstance(packed.data, buffer))
+            assert(packed.reverse_complement() == PackedStrand.from_str('TCGAGTGGACTGGATCTA'))
+            assert(hash(packed) == hash(PackedStrand.from_str('TAGATCCAGTCCACTCGA')))
+
+        # reopening only maps the files
+        with PopulationStore(self.path) as store:
+            assert(len(store) == 5)
+            assert(store.generations() == [0, 1])
+            assert(store.last_generation() == 1)
+            assert(list(store.generation(0)) == first)
+            assert(list(store.generation(1)) == second)
+            assert(list(store.generation(2)) == [])
+            assert(store.generation_of(3) == 1)
+            store.append([Strand('GG')], 5)
+            assert(store.generations() == [0, 1, 5])
+            assert(list(store.generation(5)) == [Strand('GG')])
+
+    def test_generation_order(self):
+        with PopulationStore(self.path) as store:
+            store.append([Strand('A')], 3)
+            with assert_raises(ValueError):
+                store.append([Strand('A')], 2)
+
+    def test_recovers_from_torn_write(self):
+        with PopulationStore(self.path) as store:
+            store.append([Strand('TAGATCCAG'), Strand('CAT')], 1)
+        # an append interrupted after part of its sequences and index record
+        with open(self.path + '.seq', 'ab') as f:
+            f.write('\x1b\x2c')
+        with open(self.path + '.idx', 'ab') as f:
+            f.write('\x00\x01\x02')
+
+        with PopulationStore(self.path) as store:
+            assert(len(store) == 2)
+            store.append([Strand('GGGA')], 2)
+            assert(list(store) == [Strand('TAGATCCAG'), Strand('CAT'), Strand('GGGA')])
+            assert(store.generations() == [1, 2])
+        with PopulationStore(self.path) as store:
+            assert(store[-1] == Strand('GGGA'))
+            assert(store.generations() == [1, 2])
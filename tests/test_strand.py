@@ -19,3 +19,16 @@ class TestStrand:
     def test_non_base_input(self):
         with assert_raises_regexp(InvalidStrand, 'Strand contains an invalid base unit'):
             Strand('bat')    
+
+    def test_equality(self):
+        assert Strand('catg') == Strand('CATG')
+        assert Strand('CATG') != Strand('CATT')
+        assert len(set([Strand('CATG'), Strand('CATG'), Strand('A')])) == 2
+
+    def test_immutable(self):
+        s = Strand('CATG')
+        with assert_raises(AttributeError):
+            s.strand = 'A'
+
+    def test_create(self):
+        assert Strand._create('CATG') == Strand('CATG')
@@ -0,0 +1,38 @@
+""" Run the strand -> ribosome -> enzyme -> daughter strands cycle over a file
+of strands (one per line, or FASTA-like, optionally gzipped) and write out the
+daughter strands. """
+
+from typogenetics.io import run_cycle
+from typogenetics.strand import InvalidStrand
+from typogenetics.manipulation import StrandManipulationBuffer, ArrayStrandManipulationBuffer
+from typogenetics.manipulation import StatusArrayStrandManipulationBuffer
+
+import argparse
+import sys
+
+BUFFER_CLASSES = {
+    'array': ArrayStrandManipulationBuffer,
+    'deque': StrandManipulationBuffer,
+    'status': StatusArrayStrandManipulationBuffer
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m typogenetics', description=__doc__)
+    parser.add_argument('input', help="input file, or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="output file (default: stdout)")
+    parser.add_argument('--fasta', action='store_true', help='write FASTA-like records')
+    parser.add_argument('--engine', choices=sorted(BUFFER_CLASSES), default='array',
+                        help='strand manipulation engine (default: array)')
+    args = parser.parse_args(argv)
+
+    try:
+        stats = run_cycle(args.input, args.output, args.fasta, BUFFER_CLASSES[args.engine])
+    except InvalidStrand as e:
+        parser.exit(1, '%s: error: %s\n' % (parser.prog, e))
+    sys.stderr.write('%(strands)d strands (%(bases)d bases) -> %(daughters)d daughter strands in %(seconds).2fs, '
+                     '%(strands_per_second).0f strands/s, %(bases_per_second).0f bases/s\n' % stats)
+
+
+if __name__ == '__main__':
+    main()
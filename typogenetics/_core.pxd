@@ -0,0 +1,37 @@
+# Types for compiling _core.py with Cython in pure Python mode, see typogenetics.backend
+cimport cython
+
+
+@cython.locals(window=Py_ssize_t, start=Py_ssize_t, stop=Py_ssize_t, hit=Py_ssize_t)
+cpdef Py_ssize_t find_nearest(bytearray data, Py_ssize_t pos, Py_ssize_t step, str chars) except? -2
+
+
+cdef class ArrayStrandManipulationBuffer:
+    cdef public list strands
+    cdef public Py_ssize_t flipped
+    cdef public Py_ssize_t pos
+    cdef public bint copy_mode
+    cdef public object primary
+    cdef public object secondary
+    cdef public list primary_strands
+    cdef public list secondary_strands
+
+    @cython.locals(pos=Py_ssize_t, base=long)
+    cpdef move(self, Py_ssize_t step)
+
+    @cython.locals(primary=bytearray, pos=Py_ssize_t, last=Py_ssize_t, first=Py_ssize_t, gap=Py_ssize_t,
+                   target=Py_ssize_t, start=Py_ssize_t, stop=Py_ssize_t, overrun=bint)
+    cpdef _jump(self, Py_ssize_t offset)
+
+
+cdef class StatusArrayStrandManipulationBuffer(ArrayStrandManipulationBuffer):
+
+    @cython.locals(pos=Py_ssize_t, base=long)
+    cpdef move(self, Py_ssize_t step)
+
+
+cpdef run_program(sm, tuple program)
+
+cpdef list collect_strands(list primary_strands, list secondary_strands)
+
+cpdef str translate_pairs(str strand_str, dict pair_to_opcode)
@@ -0,0 +1,329 @@
+""" The hot paths of the array engine, the enzyme interpreter loop and the
+ribosome translation. This module is plain Python, and is also Cython source
+in pure Python mode: _core.pxd declares the types for compiling it with
+
+    cythonize -i typogenetics/_core.py
+
+typogenetics.backend picks the compiled module when there is one. """
+
+from typogenetics.packed import COMPLEMENT_TABLE
+
+from operator import add
+
+BASE_COMPLEMENT = {
+    'A': 'T', 'T': 'A',
+    'G': 'C', 'C': 'G'
+}
+PLACEHOLDER = '.'
+PURINES = ['A', 'G']
+PYRIMIDINES = ['C', 'T']
+
+
+class OutOfStrandException(Exception):
+    pass
+
+
+# byte-level versions of the tables above, for the bytearray backed buffer
+EMPTY = ord(PLACEHOLDER)
+BYTE_COMPLEMENT = dict((ord(base), ord(complement)) for base, complement in BASE_COMPLEMENT.items())
+# what the scans stop at: a base of the right kind, or a gap
+PURINE_STOPS = ''.join(PURINES) + PLACEHOLDER
+PYRIMIDINE_STOPS = ''.join(PYRIMIDINES) + PLACEHOLDER
+# the scans look this far ahead first, then in growing windows
+SCAN_WINDOW = 64
+# returned instead of raising OutOfStrandException by the operations of
+# StatusArrayStrandManipulationBuffer, the other operations return None
+OUT_OF_STRAND = True
+
+
+def find_nearest(data, pos, step, chars):
+    """ Position of the nearest of chars in data, strictly to the right of pos
+        for a positive step or to the left for a negative one, or -1. The search
+        is done with find/rfind in growing windows, so the work done is in
+        proportion to the distance to the nearest match """
+    window = SCAN_WINDOW
+    if step > 0:
+        start = pos + 1
+        while start < len(data):
+            stop = min(start + window, len(data))
+            hits = [hit for hit in [data.find(c, start, stop) for c in chars] if hit != -1]
+            if hits:
+                return min(hits)
+            start = stop
+            window *= 4
+    else:
+        stop = pos
+        while stop > 0:
+            start = max(stop - window, 0)
+            hit = max([data.rfind(c, start, stop) for c in chars])
+            if hit != -1:
+                return hit
+            stop = start
+            window *= 4
+    return -1
+
+
+class ArrayStrandBuffer(object):
+    """ View of one of the strands held by an ArrayStrandManipulationBuffer.
+        Exposes the same bound/dump interface as StrandBuffer.
+    """
+
+    def __init__(self, owner, which):
+        self.owner = owner
+        self.which = which  # 0 for the primary strand, 1 for the secondary
+
+    @property
+    def bound(self):
+        owner = self.owner
+        if not len(owner.strands[0]):
+            return None
+        base = owner.strands[self.which ^ owner.flipped][owner.pos]
+        return None if base == EMPTY else chr(base)
+
+    def dump(self):
+        """ Return the whole strand as a string, in the current reading direction """
+        return self.owner.read(self.which, 0, len(self.owner.strands[0]))
+
+
+class ArrayStrandManipulationBuffer(object):
+    """ Alternative to StrandManipulationBuffer that keeps both strands in a pair
+        of aligned bytearrays with a single cursor index, using PLACEHOLDER for
+        the empty positions. Moving just changes the cursor, and swi flips the
+        reading direction instead of reversing any buffers: while flipped, the
+        primary strand is the physical upper strand read from right to left.
+        The results are identical to those of StrandManipulationBuffer.
+    """
+
+    def __init__(self, strand):
+        # strands[0] is the strand the enzyme was initially bound to
+        self.strands = [bytearray(strand), bytearray(PLACEHOLDER * len(strand))]
+        self.flipped = 0
+        self.pos = 0
+        self.primary = ArrayStrandBuffer(self, 0)
+        self.secondary = ArrayStrandBuffer(self, 1)
+        # copy mode is initially turned off
+        self.copy_mode = False
+        # lists to hold onto cut strands
+        self.primary_strands = []
+        self.secondary_strands = []
+
+    def __call__(self, operation):
+        """ Envoke the specific operator by name """
+        return getattr(self, operation)()
+
+    def read(self, which, start, stop):
+        """ Read the physical range [start, stop) of the primary (0) or secondary (1)
+            strand, in the current reading direction """
+        data = self.strands[which ^ self.flipped][start:stop]
+        if self.flipped:
+            data.reverse()
+        return str(data)
+
+    def cursor(self):
+        """ Position of the read slots, counted from the left of the primary strand """
+        return len(self.strands[0]) - 1 - self.pos if self.flipped else self.pos
+
+    def seek(self, index):
+        """ Put the base at index into the read slots of a freshly loaded strand """
+        self.pos = index
+
+    def move(self, step):
+        pos = self.pos + step
+        if not 0 <= pos < len(self.strands[0]):
+            # we've run off the end of the buffer, and therefore out of strand
+            raise OutOfStrandException
+        self.pos = pos
+        base = self.strands[self.flipped][pos]
+        if base == EMPTY:
+            # in this case, we've steped into a gap, so out of strand
+            raise OutOfStrandException
+        if self.copy_mode:
+            self.strands[1 - self.flipped][pos] = BYTE_COMPLEMENT[base]
+
+    def move_by(self, offset):
+        """ Equivalent to abs(offset) single steps of move, but the search for gaps
+            and the copying are done on whole slices """
+        if self._jump(offset):
+            raise OutOfStrandException
+
+    def _jump(self, offset):
+        """ Body of move_by, returns OUT_OF_STRAND instead of raising """
+        primary = self.strands[self.flipped]
+        pos = self.pos
+        if offset > 0:
+            last = min(pos + offset, len(primary) - 1)
+            gap = primary.find(PLACEHOLDER, pos + 1, last + 1)
+            target = last if gap == -1 else gap
+            start, stop = pos + 1, last + 1 if gap == -1 else gap
+            overrun = pos + offset > last
+        else:
+            first = max(pos + offset, 0)
+            gap = primary.rfind(PLACEHOLDER, first, pos)
+            target = first if gap == -1 else gap
+            start, stop = first if gap == -1 else gap + 1, pos
+            overrun = pos + offset < first
+        if self.copy_mode:
+            self.strands[1 - self.flipped][start:stop] = primary[start:stop].translate(COMPLEMENT_TABLE)
+        self.pos = target
+        if gap != -1 or overrun:
+            return OUT_OF_STRAND
+
+    def cut(self):
+        if self.flipped:
+            start, stop = 0, self.pos
+        else:
+            start, stop = self.pos + 1, len(self.strands[0])
+        # save the cut strands, then drop them from the buffers
+        self.primary_strands.append(self.read(0, start, stop))
+        self.secondary_strands.append(self.read(1, start, stop))
+        for data in self.strands:
+            del data[start:stop]
+        if self.flipped:
+            self.pos = 0
+
+    def swi(self):
+        if self.strands[1 - self.flipped][self.pos] == EMPTY:
+            raise OutOfStrandException
+        self.flipped = 1 - self.flipped
+
+    def delete(self):
+        self.strands[self.flipped][self.pos] = EMPTY
+        return self.mvr()
+
+    def mvr(self):
+        return self.move(-1 if self.flipped else 1)
+
+    def mvl(self):
+        return self.move(1 if self.flipped else -1)
+
+    def mvr_by(self, count):
+        return self.move_by(-count if self.flipped else count)
+
+    def mvl_by(self, count):
+        return self.move_by(count if self.flipped else -count)
+
+    def cop(self):
+        # a complement base gets set on the upper strand right away
+        self.strands[1 - self.flipped][self.pos] = BYTE_COMPLEMENT[self.strands[self.flipped][self.pos]]
+        self.copy_mode = True
+
+    def off(self):
+        self.copy_mode = False
+
+    def insert(self, base):
+        complement = BASE_COMPLEMENT[base] if self.copy_mode else PLACEHOLDER
+        if self.flipped:
+            # to the right is towards the start of the buffers
+            at = self.pos
+            self.pos += 1
+        else:
+            at = self.pos + 1
+        self.strands[self.flipped].insert(at, ord(base))
+        self.strands[1 - self.flipped].insert(at, ord(complement))
+        return self.mvr()
+
+    def ina(self):
+        return self.insert('A')
+
+    def inc(self):
+        return self.insert('C')
+
+    def ing(self):
+        return self.insert('G')
+
+    def int(self):
+        return self.insert('T')
+
+    def repeated_move(self, step, stops):
+        """ Move until reaching one of the stops, in one jump instead of step by step.
+            Gaps are always in the stops, so the move ends on the same base, or
+            runs out of strand in the same place, as moving step by step would """
+        target = find_nearest(self.strands[self.flipped], self.pos, step, stops)
+        if target == -1:
+            # run off the end of the strand
+            return self.move_by(step * len(self.strands[0]))
+        else:
+            return self.move_by(target - self.pos)
+
+    def rpy(self):
+        return self.repeated_move(-1 if self.flipped else 1, PYRIMIDINE_STOPS)
+
+    def rpu(self):
+        return self.repeated_move(-1 if self.flipped else 1, PURINE_STOPS)
+
+    def lpy(self):
+        return self.repeated_move(1 if self.flipped else -1, PYRIMIDINE_STOPS)
+
+    def lpu(self):
+        return self.repeated_move(1 if self.flipped else -1, PURINE_STOPS)
+
+    def __str__(self):
+        left = self.cursor()
+        _str = ' ' * (11 + left) + 'v' + "\n"
+        _str += "Secondary: " + self.secondary.dump() + "\n"
+        _str += "Primary:   " + self.primary.dump() + "\n"
+        _str += ' ' * (11 + left) + '^' + "\n"
+        _str += "Copy mode: " + str(self.copy_mode)
+        return _str
+
+
+class StatusArrayStrandManipulationBuffer(ArrayStrandManipulationBuffer):
+    """ ArrayStrandManipulationBuffer whose operations return OUT_OF_STRAND
+        instead of raising OutOfStrandException, leaving the buffer in the same
+        state. Most enzymes run off their strand, which this signals without
+        raising and catching an exception. The results are identical.
+    """
+
+    def move(self, step):
+        pos = self.pos + step
+        if not 0 <= pos < len(self.strands[0]):
+            return OUT_OF_STRAND
+        self.pos = pos
+        base = self.strands[self.flipped][pos]
+        if base == EMPTY:
+            return OUT_OF_STRAND
+        if self.copy_mode:
+            self.strands[1 - self.flipped][pos] = BYTE_COMPLEMENT[base]
+
+    # _jump already returns OUT_OF_STRAND, so it is used as move_by directly,
+    # saving a call on every merged move and repeated move
+    move_by = ArrayStrandManipulationBuffer.__dict__['_jump']
+
+    def swi(self):
+        if self.strands[1 - self.flipped][self.pos] == EMPTY:
+            return OUT_OF_STRAND
+        self.flipped = 1 - self.flipped
+
+
+def run_program(sm, program):
+    """ Apply the operations of an enzyme program to a buffer in order, until
+        one of them runs out of strand, by raising or returning OUT_OF_STRAND """
+    for label, operation, args in program:
+        try:
+            if operation(sm, *args):
+                break
+        except OutOfStrandException:
+            break
+
+
+def collect_strands(primary_strands, secondary_strands):
+    """ The non empty daughter strand strings of the dumped lower and upper strands """
+    strands = []
+    for s in primary_strands:
+        strands.extend(s.split(PLACEHOLDER))  # in some cases there might be gaps, so split by the null placeholder
+
+    # the upper strands need to be reversed, reversing the whole strand reverses
+    # the pieces as well as their order, so put the pieces back in order
+    for s in secondary_strands:
+        sub_strands = s[::-1].split(PLACEHOLDER)
+        sub_strands.reverse()
+        strands.extend(sub_strands)
+
+    # remove any empty strands/strings
+    return [s for s in strands if s]
+
+
+def translate_pairs(strand_str, pair_to_opcode):
+    """ Opcode of every base pair of a strand string, through pair_to_opcode """
+    strand_str = strand_str[:len(strand_str) - len(strand_str) % 2]
+    return ''.join(map(pair_to_opcode.__getitem__, map(add, strand_str[0::2], strand_str[1::2])))
@@ -1,19 +1,39 @@
 AMINO_ACIDS = ['pun', 'cut', 'delete', 'swi', 'mvr', 'mvl', 'cop', 'off',
                'ina', 'inc', 'ing', 'int', 'rpy', 'rpu', 'lpy', 'lpu']
 
+# each amino acid is given a one character opcode, its position in AMINO_ACIDS
+OPCODES = dict((op, chr(idx)) for idx, op in enumerate(AMINO_ACIDS))
+
 
 class InvalidAminoAcid(Exception):
     pass
 
 
-def _check_input(op):
-    if op not in AMINO_ACIDS:
-        raise InvalidAminoAcid('Not a valid amino acid')
-    return op
+class AminoAcid(object):
+    """ Base class for amino acid objects. There is a single, interned instance
+        for each of the AMINO_ACIDS, so AminoAcid('cut') is AminoAcid('cut') """
+
+    __slots__ = ('_op',)
+    _interned = {}
 
+    def __new__(cls, op):
+        try:
+            return cls._interned[op]
+        except (KeyError, TypeError):
+            raise InvalidAminoAcid('Not a valid amino acid')
+
+    @property
+    def op(self):
+        return self._op
+
+    def __reduce__(self):
+        # unpickle to the interned instance
+        return (AminoAcid, (self._op,))
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self._op)
 
-class AminoAcid(object):
-    """ Base class for amino acid objects """
 
-    def __init__(self, op):
-        self.op = _check_input(op)
+for _op in AMINO_ACIDS:
+    AminoAcid._interned[_op] = object.__new__(AminoAcid)
+    AminoAcid._interned[_op]._op = _op
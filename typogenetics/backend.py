@@ -0,0 +1,30 @@
+""" Selects the implementation of typogenetics._core: the compiled extension
+module when it has been built with Cython, otherwise the plain Python source.
+Setting the TYPOGENETICS_PURE_PYTHON environment variable forces the plain
+Python source, e.g. to run the tests against both:
+
+    nosetests tests
+    TYPOGENETICS_PURE_PYTHON=1 nosetests tests
+"""
+
+import imp
+import os
+
+PURE_PYTHON_ENV = 'TYPOGENETICS_PURE_PYTHON'
+SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_core.py')
+
+
+def _load_core():
+    if os.environ.get(PURE_PYTHON_ENV):
+        return imp.load_source('typogenetics._core', SOURCE_PATH)
+    from typogenetics import _core
+    return _core
+
+
+def is_compiled(module):
+    return not os.path.splitext(module.__file__)[1] in ('.py', '.pyc', '.pyo')
+
+
+core = _load_core()
+COMPILED = is_compiled(core)
+BACKEND = 'cython' if COMPILED else 'python'
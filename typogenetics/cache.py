@@ -0,0 +1,105 @@
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import apply_enzyme, StrandManipulationBuffer, CompiledEnzyme
+
+from collections import OrderedDict
+import cPickle
+
+
+def enzyme_key(enzyme):
+    """ Canonical key of an Enzyme or CompiledEnzyme: the tuple of its amino acid ops """
+    if isinstance(enzyme, CompiledEnzyme):
+        return enzyme.ops
+    return tuple(amino_acid.op for amino_acid in enzyme.amino_acids)
+
+
+class LRUCache(object):
+    """ Mapping with at most max_size entries, evicting the least recently used
+        entry when full. Counts hits and misses. """
+
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key):
+        """ Return the value stored for key, or None """
+        try:
+            # re-insert to mark as most recently used
+            value = self.data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self.data[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.data.pop(key, None)
+        self.data[key] = value
+        while len(self.data) > self.max_size:
+            self.data.popitem(last=False)
+
+    def clear(self):
+        self.data.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class TypogeneticsCache(object):
+    """ Opt-in memoization of strand_to_enzymes and apply_enzyme. Strand and
+        Enzyme objects are immutable, so results are kept as tuples of them and
+        every call returns a new list, which callers can't use to corrupt the cache.
+
+        Example:
+
+        cache = TypogeneticsCache(max_size=10000)
+        for enzyme in cache.strand_to_enzymes(strand):
+            daughters = cache.apply_enzyme(strand, enzyme)
+        cache.save('cache.pkl')
+    """
+
+    def __init__(self, max_size=100000):
+        self.enzymes = LRUCache(max_size)
+        self.daughters = LRUCache(max_size)
+
+    def strand_to_enzymes(self, strand):
+        enzymes = self.enzymes.get(strand.strand)
+        if enzymes is None:
+            enzymes = tuple(strand_to_enzymes(strand))
+            self.enzymes.put(strand.strand, enzymes)
+        return list(enzymes)
+
+    def apply_enzyme(self, strand, enzyme, buffer_class=StrandManipulationBuffer):
+        key = (strand.strand, enzyme_key(enzyme))
+        daughters = self.daughters.get(key)
+        if daughters is None:
+            daughters = tuple(apply_enzyme(strand, enzyme, buffer_class=buffer_class))
+            self.daughters.put(key, daughters)
+        return list(daughters)
+
+    def stats(self):
+        """ Hit and miss counts of both caches """
+        return {
+            'strand_to_enzymes': {'hits': self.enzymes.hits, 'misses': self.enzymes.misses,
+                                  'size': len(self.enzymes)},
+            'apply_enzyme': {'hits': self.daughters.hits, 'misses': self.daughters.misses,
+                             'size': len(self.daughters)}
+        }
+
+    def save(self, path):
+        """ Persist the cache contents so they can be shared with other runs """
+        with open(path, 'wb') as f:
+            cPickle.dump((self.enzymes.data, self.daughters.data), f, cPickle.HIGHEST_PROTOCOL)
+
+    def load(self, path):
+        """ Add the entries saved by another run """
+        with open(path, 'rb') as f:
+            enzymes, daughters = cPickle.load(f)
+        for key, value in enzymes.items():
+            self.enzymes.put(key, value)
+        for key, value in daughters.items():
+            self.daughters.put(key, value)
@@ -0,0 +1,185 @@
+from typogenetics.strand import Strand
+from typogenetics.packed import pack, unpack, BASES_PER_BYTE
+from typogenetics.evolve import cycle_str, _chunks
+from typogenetics.manipulation import ArrayStrandManipulationBuffer
+
+from functools import partial
+from heapq import nlargest
+import binascii
+import hashlib
+import math
+import struct
+import sys
+
+_HASH_PAIR = struct.Struct('<QQ')
+
+
+class BloomFilter(object):
+    """ Set membership in a fixed size bit array, sized for capacity keys with
+        the given false positive rate. Never gives false negatives. """
+
+    def __init__(self, capacity, error_rate=0.01):
+        size = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.size = max(size, 8)
+        self.hash_count = max(1, int(round(self.size / float(capacity) * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # double hashing, from the two halves of one digest
+        h1, h2 = _HASH_PAIR.unpack(hashlib.md5(key).digest())
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        """ Add a key, returning whether it was (probably) already there """
+        present = True
+        bits = self.bits
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                present = False
+                bits[position >> 3] |= mask
+        return present
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def merge(self, other):
+        """ Add all of the keys of a filter with the same size and hash count """
+        if (self.size, self.hash_count) != (other.size, other.hash_count):
+            raise ValueError('Can only merge Bloom filters of the same size and hash count')
+        merged = long(binascii.hexlify(self.bits), 16) | long(binascii.hexlify(other.bits), 16)
+        self.bits = bytearray(binascii.unhexlify('%0*x' % (2 * len(self.bits), merged)))
+
+
+class GenerationIndex(object):
+    """ Number of copies of every unique strand sequence in a generation, without
+        keeping the copies. Sequences are stored packed at 2 bits per base, plus
+        a byte for the length, unless packed=False.
+
+        With a BloomFilter, a sequence is only indexed from its second copy on, so
+        the (usually many) sequences seen once take no space beyond the filter's
+        bits. Those are then missing from the index, and a false positive can
+        count a sequence seen once as seen twice. total counts every copy.
+
+        Partial indexes, e.g. from parallel workers, are combined with merge.
+        They have to be exact, without a BloomFilter, so that the sequences they
+        saw once are carried over and counted with the copies of other parts.
+
+        Example:
+
+        index = GenerationIndex()
+        index.update(strand.strand for strand in daughter_strands)
+        for strand_str, count in index.most_common(10):
+            print strand_str, count
+    """
+
+    def __init__(self, packed=True, bloom=None):
+        self.packed = packed
+        self.bloom = bloom
+        self.counts = {}
+        self.total = 0
+
+    def _key(self, strand_str):
+        if not self.packed:
+            return strand_str
+        return pack(strand_str) + chr(len(strand_str) % BASES_PER_BYTE)
+
+    def _sequence(self, key):
+        if not self.packed:
+            return key
+        remainder = ord(key[-1])
+        length = (len(key) - 1) * BASES_PER_BYTE - (-remainder % BASES_PER_BYTE)
+        return unpack(key[:-1], length)
+
+    def _add_key(self, key, count):
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+        elif self.bloom is None:
+            counts[key] = count
+        elif self.bloom.add(key):
+            # the first copy was only recorded in the filter
+            counts[key] = count + 1
+        elif count > 1:
+            counts[key] = count
+
+    def add(self, strand_str, count=1):
+        """ Add count copies of a valid, upper case strand string """
+        self.total += count
+        self._add_key(self._key(strand_str), count)
+
+    def update(self, strand_strs):
+        for strand_str in strand_strs:
+            self.add(strand_str)
+
+    def merge(self, other):
+        """ Add the counts of another, exact index. This index's BloomFilter, if
+            any, then applies to the combined counts as if they were added one
+            by one. An index with a BloomFilter can't be merged, as the copies
+            it only recorded in its filter would be lost. """
+        if other.bloom is not None:
+            raise ValueError('Can only merge indexes without a Bloom filter')
+        same_keys = self.packed == other.packed
+        for key, count in other.counts.iteritems():
+            self._add_key(key if same_keys else self._key(other._sequence(key)), count)
+        self.total += other.total
+        return self
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, strand_str):
+        return self._key(strand_str) in self.counts
+
+    def count(self, strand_str):
+        return self.counts.get(self._key(strand_str), 0)
+
+    def items(self):
+        """ Iterate over the (strand string, count) pairs """
+        for key, count in self.counts.iteritems():
+            yield self._sequence(key), count
+
+    def strands(self):
+        """ Iterate over the unique Strands """
+        for key in self.counts:
+            yield Strand._create(self._sequence(key))
+
+    def most_common(self, n):
+        return [(self._sequence(key), count)
+                for key, count in nlargest(n, self.counts.iteritems(), key=lambda item: item[1])]
+
+    def nbytes(self):
+        """ Approximate memory used by the index """
+        size = sys.getsizeof(self.counts) + sum(sys.getsizeof(key) for key in self.counts)
+        if self.bloom is not None:
+            size += sys.getsizeof(self.bloom.bits)
+        return size
+
+
+def _index_chunk(chunk, buffer_class, packed):
+    """ Worker task: exactly index the daughters of a chunk of strand strings """
+    index = GenerationIndex(packed)
+    for strand_str in chunk:
+        index.update(cycle_str(strand_str, buffer_class))
+    return index
+
+
+def index_generation(population, pool=None, chunk_size=256, packed=True, bloom_capacity=None, error_rate=0.01,
+                     buffer_class=ArrayStrandManipulationBuffer):
+    """ Run the cycle on every strand of the population and return the
+        GenerationIndex of the daughter strands. Chunks of the population are
+        indexed by the pool's workers, and their exact partial indexes merged.
+        With a bloom_capacity, the merged index is pre-filtered by a BloomFilter
+        of that capacity and error_rate, see GenerationIndex. """
+    task = partial(_index_chunk, buffer_class=buffer_class, packed=packed)
+    chunks = _chunks([strand.strand for strand in population], chunk_size)
+    if pool is None:
+        results = (task(chunk) for chunk in chunks)
+    else:
+        results = pool.imap(task, chunks)
+
+    index = GenerationIndex(packed, BloomFilter(bloom_capacity, error_rate) if bloom_capacity else None)
+    for partial_index in results:
+        index.merge(partial_index)
+    return index
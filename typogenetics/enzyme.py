@@ -1,5 +1,6 @@
 import typogenetics.amino_acid as aa
-from collections import deque
+
+from string import maketrans
 
 
 ABSOLUTE_TO_BINDING = {
@@ -23,6 +24,17 @@ RELATIVE_TRANSFORMATIONS = {
     'L': {'s': 'L', 'l': 'D', 'r': 'U'}
 }
 
+# the absolute directions in the order they are reached by turning left. The
+# final direction of a fold only depends on the number of left turns minus the
+# number of right turns, mod 4, so the binding can be looked up from that count
+LEFT_TURN_ORDER = ['R', 'U', 'L', 'D']
+TURNS_TO_BINDING = [ABSOLUTE_TO_BINDING[direction] for direction in LEFT_TURN_ORDER]
+RELATIVE_TURNS = {'s': 0, 'l': 1, 'r': -1}
+
+_AMINO_ACID_TURNS = dict((aa.AminoAcid(op), RELATIVE_TURNS[relative]) for op, relative in ENZYME_TO_RELATIVE.items())
+_OPCODE_TO_RELATIVE = maketrans(''.join(aa.OPCODES[op] for op in ENZYME_TO_RELATIVE),
+                                ''.join(ENZYME_TO_RELATIVE.values()))
+
 
 class InvalidEnzyme(Exception):
     pass
@@ -39,29 +51,60 @@ def _check_amino_acids(amino_acid_list):
     return
 
 
+def binding_preference(amino_acids):
+    """ Determine the binding preference of a sequence of amino acids from the folding directions """
+    # always start off heading to the right, and don't include the first and last movements
+    turns = sum(map(_AMINO_ACID_TURNS.__getitem__, amino_acids[1:-1]))
+    return TURNS_TO_BINDING[turns % 4]
+
+
+def opcodes_binding_preference(opcodes):
+    """ Binding preference of an enzyme given as a string of amino acid opcodes """
+    relative_directions = opcodes[1:-1].translate(_OPCODE_TO_RELATIVE)
+    return TURNS_TO_BINDING[(relative_directions.count('l') - relative_directions.count('r')) % 4]
+
+
 class Enzyme(object):
-    """ Enzyme class. Basically a container for amino acids, along with a method
-        for determining the preferred binding """
+    """ Enzyme class. Basically an immutable container for amino acids, along with
+        its preferred binding. Enzymes compare and hash by their amino acids. """
+
+    __slots__ = ('_amino_acids', '_binding_preference')
 
     def __init__(self, amino_acid_list):
         _check_amino_acids(amino_acid_list)
-        self.amino_acids = deque(amino_acid_list)
-        self.binding_preference = self.binding_preference()
+        self._amino_acids = tuple(amino_acid_list)
+        self._binding_preference = binding_preference(self._amino_acids)
+
+    @classmethod
+    def _create(cls, amino_acids, preference=None):
+        """ Build an enzyme from a tuple of amino acids that is known to be valid,
+            and optionally its already computed binding preference """
+        enzyme = object.__new__(cls)
+        enzyme._amino_acids = amino_acids
+        enzyme._binding_preference = preference or binding_preference(amino_acids)
+        return enzyme
+
+    @property
+    def amino_acids(self):
+        return self._amino_acids
+
+    @property
+    def binding_preference(self):
+        return self._binding_preference
+
+    def __eq__(self, other):
+        return isinstance(other, Enzyme) and self._amino_acids == other._amino_acids
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._amino_acids)
+
+    def __reduce__(self):
+        return (Enzyme, (list(self._amino_acids),))
 
     def __str__(self):
         _str = "Amino acids: " + "-".join([amino_acid.op for amino_acid in self.amino_acids]) + "\n"
         _str += "Binding preference: " + self.binding_preference
         return _str
-
-    def binding_preference(self):
-        """ Determine the enzyme's binding preference from the folding directions """
-        # apply the mapping from amino acid to relative path directions
-        relative_directions = [ENZYME_TO_RELATIVE[amino_acid.op] for amino_acid in self.amino_acids]
-
-        # always start off heading to the right
-        absolute_direction = 'R'
-        for relative_direction in relative_directions[1:-1]:  # don't include the first and last movements
-            # transform the absolute direction based on the relative changes in direction
-            absolute_direction = RELATIVE_TRANSFORMATIONS[absolute_direction][relative_direction]
-
-        return ABSOLUTE_TO_BINDING[absolute_direction]
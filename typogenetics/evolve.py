@@ -0,0 +1,120 @@
+from __future__ import absolute_import
+
+from typogenetics.strand import Strand
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import apply_enzyme, apply_enzyme_to_str, ArrayStrandManipulationBuffer
+
+from functools import partial
+import multiprocessing
+import random
+
+
+def cycle(strand, buffer_class=ArrayStrandManipulationBuffer, cache=None):
+    """ Run one strand -> ribosome -> enzyme -> daughter strands cycle. All of the
+        enzymes are applied to the original strand. Results are memoized when a
+        TypogeneticsCache is given """
+    if cache is None:
+        translate, apply = strand_to_enzymes, apply_enzyme
+    else:
+        translate, apply = cache.strand_to_enzymes, cache.apply_enzyme
+
+    daughters = []
+    for enzyme in translate(strand):
+        daughters.extend(apply(strand, enzyme, buffer_class=buffer_class))
+    return daughters
+
+
+def _enzyme_daughters(strand_str, enzyme, buffer_class):
+    """ Daughter strand strings of an enzyme, or the strand itself when the
+        enzyme doesn't bind """
+    daughter_strs = apply_enzyme_to_str(strand_str, enzyme, buffer_class=buffer_class)
+    return [strand_str] if daughter_strs is None else daughter_strs
+
+
+def cycle_str(strand_str, buffer_class=ArrayStrandManipulationBuffer):
+    """ Same as cycle, for a valid, upper case strand string, returning the
+        daughter strand strings """
+    daughters = []
+    for enzyme in strand_to_enzymes(Strand._create(strand_str)):
+        daughters.extend(_enzyme_daughters(strand_str, enzyme, buffer_class))
+    return daughters
+
+
+def cycle_str_by_enzyme(strand_str, buffer_class=ArrayStrandManipulationBuffer):
+    """ Same as cycle_str, keeping the daughters of each enzyme apart, as a list
+        of (amino acid ops, daughter strand strings) """
+    return [(tuple(amino_acid.op for amino_acid in enzyme.amino_acids),
+             _enzyme_daughters(strand_str, enzyme, buffer_class))
+            for enzyme in strand_to_enzymes(Strand._create(strand_str))]
+
+
+def _cycle_chunk(chunk, buffer_class, by_enzyme=False):
+    """ Worker task: run the cycle on a chunk of strand strings """
+    if by_enzyme:
+        return [cycle_str_by_enzyme(s, buffer_class) for s in chunk]
+    return [cycle_str(s, buffer_class) for s in chunk]
+
+
+def _chunks(items, size):
+    for idx in range(0, len(items), size):
+        yield items[idx:idx + size]
+
+
+def next_generation(population, pool=None, chunk_size=256, population_cap=None, rng=None,
+                    buffer_class=ArrayStrandManipulationBuffer, lineage=None):
+    """ Run the cycle on every strand of the population and return the unique
+        daughter strands, in order of first appearance. The strands are sent to
+        the pool in chunks of chunk_size, and the chunk results are collected in
+        order, so the result doesn't depend on the number of workers. When there
+        are more than population_cap daughters, a sample drawn with rng is kept.
+        The daughters are recorded in a LineageRecorder, when one is given.
+    """
+    strand_strs = [strand.strand for strand in population]
+    task = partial(_cycle_chunk, buffer_class=buffer_class, by_enzyme=lineage is not None)
+    chunks = _chunks(strand_strs, chunk_size)
+    if pool is None:
+        results = (task(chunk) for chunk in chunks)
+    else:
+        results = pool.imap(task, chunks)
+
+    if lineage is not None:
+        daughters = lineage.record_generation(strand_strs, (r for chunk_result in results for r in chunk_result))
+    else:
+        # deduplicate by sequence
+        seen = set()
+        daughters = []
+        for chunk_result in results:
+            for daughter_strs in chunk_result:
+                for s in daughter_strs:
+                    if s not in seen:
+                        seen.add(s)
+                        daughters.append(s)
+
+    if population_cap is not None and len(daughters) > population_cap:
+        daughters = (rng or random).sample(daughters, population_cap)
+
+    return [Strand._create(s) for s in daughters]
+
+
+def evolve(population, generations, processes=None, chunk_size=256, population_cap=None, seed=None,
+           buffer_class=ArrayStrandManipulationBuffer, lineage=None):
+    """ Run the cycle over a whole population for a number of generations, yielding
+        (generation, population) after each one. The work is spread over a pool of
+        processes (all CPUs by default, or run in this process when processes=1).
+        The populations only depend on the seed, never on the number of processes.
+        With a LineageRecorder, the parent and enzyme of every daughter are recorded.
+
+        Example:
+
+        for generation, population in evolve([Strand('TAGATCCAGTCCACTCGA')], 10, seed=0):
+            print generation, len(population)
+    """
+    rng = random.Random(seed)
+    pool = None if processes == 1 else multiprocessing.Pool(processes)
+    try:
+        for generation in range(1, generations + 1):
+            population = next_generation(population, pool, chunk_size, population_cap, rng, buffer_class, lineage)
+            yield generation, population
+    finally:
+        if pool is not None:
+            pool.terminate()
@@ -0,0 +1,249 @@
+""" Genetic algorithm over strand sequences: selection, mutation and crossover
+operators, pluggable fitness objectives, and a GeneticAlgorithm that evaluates
+the fitness of each generation on a pool of processes, caching the fitness of
+every genome it has already seen. """
+
+from __future__ import absolute_import
+
+from typogenetics.strand import Strand, BASES
+from typogenetics.evolve import cycle_str, _chunks
+from typogenetics.manipulation import ArrayStrandManipulationBuffer
+from typogenetics.cache import LRUCache
+
+from difflib import SequenceMatcher
+from functools import partial
+import multiprocessing
+import random
+
+
+class Fitness(object):
+    """ Base class of the fitness objectives, which implement score. Higher is
+        fitter. Objectives are pickled to the worker processes, so they have to
+        be defined at module level. """
+
+    def score(self, strand_str):
+        raise NotImplementedError
+
+
+class DaughterCount(Fitness):
+    """ Number of daughter strands of one cycle """
+
+    def __init__(self, buffer_class=ArrayStrandManipulationBuffer):
+        self.buffer_class = buffer_class
+
+    def score(self, strand_str):
+        return float(len(cycle_str(strand_str, self.buffer_class)))
+
+
+class LengthGrowth(Fitness):
+    """ Total length of the daughter strands of one cycle, relative to the
+        strand's, or 0 for the empty strand """
+
+    def __init__(self, buffer_class=ArrayStrandManipulationBuffer):
+        self.buffer_class = buffer_class
+
+    def score(self, strand_str):
+        if not strand_str:
+            return 0.0
+        return sum(len(s) for s in cycle_str(strand_str, self.buffer_class)) / float(len(strand_str))
+
+
+class TargetSimilarity(Fitness):
+    """ Similarity, from 0 to 1, of the closest daughter strand of one cycle to a
+        target strand, or of the strand itself with daughters=False """
+
+    def __init__(self, target, daughters=True, buffer_class=ArrayStrandManipulationBuffer):
+        self.target = getattr(target, 'strand', target)
+        self.daughters = daughters
+        self.buffer_class = buffer_class
+
+    def score(self, strand_str):
+        candidates = cycle_str(strand_str, self.buffer_class) if self.daughters else [strand_str]
+        return max([SequenceMatcher(None, s, self.target).ratio() for s in candidates] or [0.0])
+
+
+class WeightedSum(Fitness):
+    """ Weighted sum of other objectives, given as (weight, fitness) pairs """
+
+    def __init__(self, terms):
+        self.terms = list(terms)
+
+    def score(self, strand_str):
+        return sum(weight * fitness.score(strand_str) for weight, fitness in self.terms)
+
+
+def point_mutation(strand_str, rate, rng):
+    """ Replace every base, with probability rate, by one of the other bases """
+    bases = list(strand_str)
+    for idx, base in enumerate(bases):
+        if rng.random() < rate:
+            bases[idx] = rng.choice([b for b in BASES if b != base])
+    return ''.join(bases)
+
+
+def indel_mutation(strand_str, rate, rng):
+    """ Delete every base, or insert a random base after it, each with
+        probability rate. Never deletes the last remaining base. """
+    bases = []
+    for idx, base in enumerate(strand_str):
+        r = rng.random()
+        if r < rate and (bases or idx < len(strand_str) - 1):
+            continue
+        bases.append(base)
+        if rate <= r < 2 * rate:
+            bases.append(rng.choice(BASES))
+    return ''.join(bases)
+
+
+def one_point_crossover(a, b, rng):
+    """ Swap the tails of two strand strings after a random cut point, which is
+        at least a base in from either end of the shorter one """
+    shortest = min(len(a), len(b))
+    if shortest < 2:
+        return a, b
+    cut = rng.randint(1, shortest - 1)
+    return a[:cut] + b[cut:], b[:cut] + a[cut:]
+
+
+def two_point_crossover(a, b, rng):
+    """ Swap the middle sections of two strand strings between two random cut points """
+    shortest = min(len(a), len(b))
+    if shortest < 3:
+        return one_point_crossover(a, b, rng)
+    first, second = sorted(rng.sample(range(1, shortest), 2))
+    return a[:first] + b[first:second] + a[second:], b[:first] + a[first:second] + b[second:]
+
+
+def tournament_selection(strand_strs, fitnesses, count, rng, size=3):
+    """ Pick count strands, each the fittest of size strands drawn at random """
+    selected = []
+    for _ in range(count):
+        best = max(rng.sample(range(len(strand_strs)), min(size, len(strand_strs))), key=fitnesses.__getitem__)
+        selected.append(strand_strs[best])
+    return selected
+
+
+def roulette_selection(strand_strs, fitnesses, count, rng):
+    """ Pick count strands with probabilities in proportion to their fitness,
+        shifted so that the least fit strand has none unless they're all equal """
+    lowest = min(fitnesses)
+    weights = [fitness - lowest for fitness in fitnesses]
+    total = sum(weights)
+    if not total:
+        return [rng.choice(strand_strs) for _ in range(count)]
+    selected = []
+    for _ in range(count):
+        target = rng.random() * total
+        for strand_str, weight in zip(strand_strs, weights):
+            target -= weight
+            if target < 0:
+                break
+        selected.append(strand_str)
+    return selected
+
+
+def truncation_selection(strand_strs, fitnesses, count, rng, fraction=0.5):
+    """ Pick count strands at random from the fittest fraction of them """
+    ranked = sorted(range(len(strand_strs)), key=lambda idx: -fitnesses[idx])
+    top = ranked[:max(1, int(len(ranked) * fraction))]
+    return [strand_strs[rng.choice(top)] for _ in range(count)]
+
+
+def _score_chunk(chunk, fitness):
+    """ Worker task: score a chunk of strand strings """
+    return [fitness.score(strand_str) for strand_str in chunk]
+
+
+class GeneticAlgorithm(object):
+    """ Evolves a population of strands towards higher fitness. Every
+        generation keeps the elitism fittest strands, and fills up to
+        population_size with children of selected parents, recombined with
+        crossover at crossover_rate and mutated with point_rate and indel_rate.
+
+        The fitness of the strands new to the cache is evaluated in chunks of
+        chunk_size, on a pool of processes (all CPUs by default, or in this
+        process when processes=1). The results only depend on the seed.
+
+        Example:
+
+        ga = GeneticAlgorithm(TargetSimilarity('TAGATCCAGTCCACTCGA'), population_size=200, seed=0)
+        for generation, population, fitnesses in ga.run([Strand('CATG')] * 200, 50):
+            print generation, max(fitnesses)
+        print ga.best
+    """
+
+    def __init__(self, fitness, population_size=100, elitism=1, crossover_rate=0.7, point_rate=0.01,
+                 indel_rate=0.0, selection=tournament_selection, crossover=one_point_crossover,
+                 processes=None, chunk_size=64, cache_size=100000, seed=None):
+        self.fitness = fitness
+        self.population_size = population_size
+        self.elitism = elitism
+        self.crossover_rate = crossover_rate
+        self.point_rate = point_rate
+        self.indel_rate = indel_rate
+        self.selection = selection
+        self.crossover = crossover
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self.cache = LRUCache(cache_size)
+        self.rng = random.Random(seed)
+        # fittest (fitness, strand string) evaluated so far
+        self.best = None
+
+    def evaluate(self, strand_strs, pool=None):
+        """ Fitness of each strand string, from the cache or evaluated on the pool """
+        scores = {}
+        missing = []
+        for strand_str in strand_strs:
+            if strand_str in scores:
+                continue
+            score = self.cache.get(strand_str)
+            scores[strand_str] = score
+            if score is None:
+                missing.append(strand_str)
+
+        task = partial(_score_chunk, fitness=self.fitness)
+        chunks = list(_chunks(missing, self.chunk_size))
+        results = pool.imap(task, chunks) if pool is not None else (task(chunk) for chunk in chunks)
+        for chunk, chunk_scores in zip(chunks, results):
+            for strand_str, score in zip(chunk, chunk_scores):
+                scores[strand_str] = score
+                self.cache.put(strand_str, score)
+                if self.best is None or score > self.best[0]:
+                    self.best = (score, strand_str)
+        return [scores[strand_str] for strand_str in strand_strs]
+
+    def mutate(self, strand_str):
+        if self.point_rate:
+            strand_str = point_mutation(strand_str, self.point_rate, self.rng)
+        if self.indel_rate:
+            strand_str = indel_mutation(strand_str, self.indel_rate, self.rng)
+        return strand_str
+
+    def next_generation(self, strand_strs, fitnesses):
+        """ Strand strings of the next generation """
+        ranked = sorted(range(len(strand_strs)), key=lambda idx: -fitnesses[idx])
+        children = [strand_strs[idx] for idx in ranked[:self.elitism]]
+        while len(children) < self.population_size:
+            a, b = self.selection(strand_strs, fitnesses, 2, self.rng)
+            if self.rng.random() < self.crossover_rate:
+                a, b = self.crossover(a, b, self.rng)
+            children.append(self.mutate(a))
+            if len(children) < self.population_size:
+                children.append(self.mutate(b))
+        return children
+
+    def run(self, population, generations):
+        """ Evolve the population of Strands for a number of generations, yielding
+            (generation, population, fitnesses) after each one """
+        pool = None if self.processes == 1 else multiprocessing.Pool(self.processes)
+        try:
+            strand_strs = [strand.strand for strand in population]
+            fitnesses = self.evaluate(strand_strs, pool)
+            for generation in range(1, generations + 1):
+                strand_strs = self.next_generation(strand_strs, fitnesses)
+                fitnesses = self.evaluate(strand_strs, pool)
+                yield generation, [Strand._create(s) for s in strand_strs], fitnesses
+        finally:
+            if pool is not None:
+                pool.terminate()
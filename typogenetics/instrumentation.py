@@ -0,0 +1,113 @@
+from collections import defaultdict
+import json
+
+
+class Observer(object):
+    """ Interface of the observers that can be passed to apply_enzyme,
+        apply_enzyme_to_str and apply_enzyme_batch. All of the callbacks do
+        nothing, so subclasses only need to override the ones they want. """
+
+    def on_bind_failed(self, strand_str, enzyme):
+        """ The enzyme found no binding site on the strand """
+        pass
+
+    def on_bind(self, strand_str, site):
+        """ The enzyme bound to the strand at site """
+        pass
+
+    def on_op(self, label, elapsed_ns, moved, terminated):
+        """ An operation was run. label is the op, or ops joined by '-' for the
+            moves executed of a merged run, moved the number of bases the read
+            slots moved, and terminated whether it ran out of strand """
+        pass
+
+    def on_done(self, daughter_strs):
+        """ The enzyme finished, leaving these daughter strands """
+        pass
+
+
+class OpStats(Observer):
+    """ Observer that aggregates counters over any number of enzyme applications:
+        the operations run and nanoseconds spent per amino acid, bases moved,
+        runs cut short by running out of strand, binding failures, and daughters.
+
+        Example:
+
+        stats = OpStats()
+        apply_enzyme(strand, enzyme, observer=stats)
+        print stats.to_prometheus()
+    """
+
+    def __init__(self):
+        self.ops = defaultdict(int)
+        self.op_nanoseconds = defaultdict(int)
+        self.bases_moved = 0
+        self.out_of_strand = 0
+        self.binding_failures = 0
+        self.applications = 0
+        self.daughters = 0
+
+    def on_bind_failed(self, strand_str, enzyme):
+        self.binding_failures += 1
+
+    def on_bind(self, strand_str, site):
+        self.applications += 1
+
+    def on_op(self, label, elapsed_ns, moved, terminated):
+        ops = label.split('-')
+        self.ops[ops[0]] += len(ops)
+        self.op_nanoseconds[ops[0]] += elapsed_ns
+        self.bases_moved += moved
+        if terminated:
+            self.out_of_strand += 1
+
+    def on_done(self, daughter_strs):
+        self.daughters += len(daughter_strs)
+
+    def merge(self, other):
+        """ Add the counters of another OpStats, e.g. one from a worker process """
+        for op, count in other.ops.items():
+            self.ops[op] += count
+        for op, ns in other.op_nanoseconds.items():
+            self.op_nanoseconds[op] += ns
+        self.bases_moved += other.bases_moved
+        self.out_of_strand += other.out_of_strand
+        self.binding_failures += other.binding_failures
+        self.applications += other.applications
+        self.daughters += other.daughters
+        return self
+
+    def to_dict(self):
+        return {
+            'ops': dict(self.ops),
+            'op_nanoseconds': dict(self.op_nanoseconds),
+            'bases_moved': self.bases_moved,
+            'out_of_strand': self.out_of_strand,
+            'binding_failures': self.binding_failures,
+            'applications': self.applications,
+            'daughters': self.daughters
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    def to_prometheus(self, prefix='typogenetics'):
+        """ The counters in the Prometheus text exposition format """
+        lines = []
+
+        def counter(name, help_text, samples):
+            lines.append('# HELP %s_%s %s' % (prefix, name, help_text))
+            lines.append('# TYPE %s_%s counter' % (prefix, name))
+            for labels, value in samples:
+                lines.append('%s_%s%s %d' % (prefix, name, labels, value))
+
+        counter('ops_total', 'Amino acid operations run.',
+                [('{op="%s"}' % op, count) for op, count in sorted(self.ops.items())])
+        counter('op_nanoseconds_total', 'Time spent running amino acid operations.',
+                [('{op="%s"}' % op, ns) for op, ns in sorted(self.op_nanoseconds.items())])
+        counter('bases_moved_total', 'Bases moved over by the read slots.', [('', self.bases_moved)])
+        counter('out_of_strand_total', 'Enzymes stopped by running out of strand.', [('', self.out_of_strand)])
+        counter('binding_failures_total', 'Enzymes that found no binding site.', [('', self.binding_failures)])
+        counter('applications_total', 'Enzymes bound and applied.', [('', self.applications)])
+        counter('daughters_total', 'Daughter strands produced.', [('', self.daughters)])
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,122 @@
+""" Enzyme x strand interaction matrices: every enzyme of a list applied to every
+strand of a population. The matrix is sparse, as only the cells where the
+enzyme binds to the strand are computed and kept, and is streamed out in tiles
+rather than held in memory. """
+
+from typogenetics.amino_acid import AminoAcid
+from typogenetics.enzyme import Enzyme
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import CompiledEnzyme, ArrayStrandManipulationBuffer, _run_program
+from typogenetics.cache import enzyme_key
+from typogenetics.io import open_file
+from typogenetics.evolve import _chunks
+
+from functools import partial
+from itertools import product
+import multiprocessing
+import sys
+
+ENZYME_TILE_SIZE = 64
+STRAND_TILE_SIZE = 256
+
+
+def population_enzymes(strands):
+    """ The enzymes of every strand of a population, and the index of the strand
+        that produced each of them """
+    enzymes = []
+    producers = []
+    for idx, strand in enumerate(strands):
+        for enzyme in strand_to_enzymes(strand):
+            enzymes.append(enzyme)
+            producers.append(idx)
+    return enzymes, producers
+
+
+def _interaction_tile(tile, buffer_class):
+    """ Worker task: the bound cells of a tile, as (enzyme index, strand index,
+        daughter strand strings) sorted by enzyme and strand """
+    enzyme_items, strand_items = tile
+    # only 4 binding preferences, so every binding site is looked up once per strand
+    groups = {}
+    for i, ops in enzyme_items:
+        enzyme = CompiledEnzyme(Enzyme._create(tuple(AminoAcid(op) for op in ops)), buffer_class)
+        groups.setdefault(enzyme.binding_preference, []).append((i, enzyme.program))
+
+    cells = []
+    for j, strand_str in strand_items:
+        for preference, programs in groups.iteritems():
+            site = strand_str.find(preference)
+            if site == -1:
+                continue
+            for i, program in programs:
+                cells.append((i, j, tuple(_run_program(strand_str, site, program, buffer_class))))
+    cells.sort()
+    return cells
+
+
+def interactions(enzymes, strands, processes=None, enzyme_tile_size=ENZYME_TILE_SIZE,
+                 strand_tile_size=STRAND_TILE_SIZE, buffer_class=ArrayStrandManipulationBuffer):
+    """ Apply every enzyme to every strand, yielding (enzyme index, strand index,
+        daughter strand strings) for the cells where the enzyme binds. The other
+        cells would leave the strand unchanged, and are skipped.
+
+        The enzymes are sorted by binding preference and split, along with the
+        strands, into tiles that are computed on a pool of processes (all CPUs
+        by default, or in this process when processes=1). Cells are yielded
+        tile by tile, in the same order whatever the number of processes.
+
+        Example:
+
+        enzymes, producers = population_enzymes(population)
+        for i, j, daughter_strs in interactions(enzymes, population):
+            print producers[i], j, daughter_strs
+    """
+    enzyme_ops = [enzyme_key(enzyme) for enzyme in enzymes]
+    order = sorted(range(len(enzymes)), key=lambda i: enzymes[i].binding_preference)
+    enzyme_tiles = list(_chunks([(i, enzyme_ops[i]) for i in order], enzyme_tile_size))
+    strand_tiles = list(_chunks([(j, strand.strand) for j, strand in enumerate(strands)], strand_tile_size))
+    tiles = product(enzyme_tiles, strand_tiles)
+
+    task = partial(_interaction_tile, buffer_class=buffer_class)
+    pool = None if processes == 1 else multiprocessing.Pool(processes)
+    try:
+        results = pool.imap(task, tiles) if pool is not None else (task(tile) for tile in tiles)
+        for cells in results:
+            for cell in cells:
+                yield cell
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def write_interactions(path, enzymes, strands, **kwargs):
+    """ Stream the interactions of the enzymes and strands to path (gzipped when
+        it ends with .gz), as tab separated enzyme index, strand index and comma
+        separated daughter strands. Keyword arguments go to interactions.
+        Returns the number of bound cells written. """
+    count = 0
+    f = open_file(path, 'w')
+    try:
+        f.write('# enzymes=%d strands=%d\n' % (len(enzymes), len(strands)))
+        for i, j, daughter_strs in interactions(enzymes, strands, **kwargs):
+            f.write('%d\t%d\t%s\n' % (i, j, ','.join(daughter_strs)))
+            count += 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return count
+
+
+def read_interactions(path):
+    """ Iterate over the (enzyme index, strand index, daughter strand strings)
+        cells written by write_interactions """
+    f = open_file(path, 'r')
+    try:
+        for line in f:
+            if line.startswith('#'):
+                continue
+            i, j, daughters = line.rstrip('\n').split('\t')
+            yield int(i), int(j), tuple(daughters.split(',')) if daughters else ()
+    finally:
+        if f is not sys.stdin:
+            f.close()
@@ -0,0 +1,132 @@
+from typogenetics.strand import Strand, InvalidStrand
+from typogenetics.evolve import cycle
+from typogenetics.manipulation import ArrayStrandManipulationBuffer
+
+import gzip
+import sys
+import time
+
+WRITE_BATCH_SIZE = 4096
+
+
+def open_file(path, mode='r'):
+    """ Open a plain or gzipped (.gz) file, or stdin/stdout for '-' """
+    if path == '-':
+        return sys.stdin if 'r' in mode else sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 'b')
+    return open(path, mode + 'b', 1 << 16)
+
+
+def _record(name, strand_str, line_number):
+    try:
+        return name, Strand(strand_str)
+    except InvalidStrand as e:
+        raise InvalidStrand('Record %s on line %d: %s' % (name, line_number, e))
+
+
+def read_records(f):
+    """ Lazily read (name, Strand) records from a file object. The file can hold
+        either one strand per line, named by their number, or FASTA-like records
+        with a '>name' header line followed by the strand on one or more lines.
+        Empty lines and lines starting with '#' or ';' are skipped. An invalid
+        strand raises InvalidStrand with the name and line number of its record. """
+    name = None
+    chunks = []
+    number = 0
+    start = 0
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line[0] == '>':
+            if name is not None:
+                yield _record(name, ''.join(chunks), start)
+            number += 1
+            name = line[1:].strip() or str(number)
+            chunks = []
+            start = line_number
+        elif name is not None:
+            chunks.append(line)
+        else:
+            number += 1
+            yield _record(str(number), line, line_number)
+    if name is not None:
+        yield _record(name, ''.join(chunks), start)
+
+
+def read_strands(f):
+    """ Lazily read the strands of a file object, see read_records """
+    for name, strand in read_records(f):
+        yield strand
+
+
+def write_records(records, f, fasta=False):
+    """ Write (name, Strand) records to a file object as they come, in batches of
+        lines, either one strand per line or as FASTA. Returns the number of
+        records written. """
+    count = 0
+    lines = []
+    for name, strand in records:
+        if fasta:
+            lines.append('>%s\n' % name)
+        lines.append(strand.strand + '\n')
+        count += 1
+        if len(lines) >= WRITE_BATCH_SIZE:
+            f.writelines(lines)
+            lines = []
+    f.writelines(lines)
+    return count
+
+
+def cycle_records(records, buffer_class=ArrayStrandManipulationBuffer):
+    """ Lazily run the strand -> ribosome -> enzyme -> daughter strands cycle on
+        each record, naming the daughters of 'name' as 'name.1', 'name.2', ... """
+    for name, strand in records:
+        for idx, daughter in enumerate(cycle(strand, buffer_class)):
+            yield '%s.%d' % (name, idx + 1), daughter
+
+
+class Counter(object):
+    """ Pass-through for (name, Strand) records that counts them and their bases """
+
+    def __init__(self, records):
+        self.records = records
+        self.count = 0
+        self.bases = 0
+
+    def __iter__(self):
+        for name, strand in self.records:
+            self.count += 1
+            self.bases += len(strand.strand)
+            yield name, strand
+
+
+def run_cycle(input_path, output_path, fasta=False, buffer_class=ArrayStrandManipulationBuffer):
+    """ Stream the strands of input_path through one cycle, writing the daughter
+        strands to output_path with bounded memory. Returns throughput stats. """
+    start = time.time()
+    input_file = open_file(input_path, 'r')
+    output_file = open_file(output_path, 'w')
+    try:
+        parents = Counter(read_records(input_file))
+        daughters = Counter(cycle_records(parents, buffer_class))
+        write_records(daughters, output_file, fasta)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+        else:
+            output_file.flush()
+    elapsed = max(time.time() - start, 1e-9)
+
+    return {
+        'strands': parents.count,
+        'bases': parents.bases,
+        'daughters': daughters.count,
+        'daughter_bases': daughters.bases,
+        'seconds': elapsed,
+        'strands_per_second': parents.count / elapsed,
+        'bases_per_second': parents.bases / elapsed
+    }
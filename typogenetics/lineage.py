@@ -0,0 +1,161 @@
+from array import array
+from itertools import izip
+import json
+
+# no parent or enzyme, for the strands a lineage starts from
+NONE = -1
+COLUMNS = ['sequence', 'parent', 'enzyme', 'generation']
+MAGIC = 'typogenetics-lineage'
+
+
+class LineageRecorder(object):
+    """ Genealogy of the strands of an evolving population. Every record is a
+        strand of a generation, with the record of its parent strand and the
+        enzyme that made it. The records are kept in typed arrays, one per
+        column, and sequences and enzymes are interned, so that a record costs
+        16 bytes whatever the length of its strand.
+
+        Only the first parent and enzyme to make each unique daughter strand of
+        a generation are recorded, in line with the deduplication of evolve.
+
+        Example:
+
+        lineage = LineageRecorder()
+        for generation, population in evolve(population, 10, lineage=lineage):
+            pass
+        for record in lineage.ancestors(lineage.records_of(population[0].strand)[-1]):
+            print lineage.generation_of(record), lineage.sequence_of(record), lineage.enzyme_of(record)
+    """
+
+    def __init__(self):
+        self.sequence = array('i')
+        self.parent = array('i')
+        self.enzyme = array('i')
+        self.generation = array('i')
+        self.sequences = []
+        self.enzymes = []
+        self._sequence_ids = {}
+        self._enzyme_ids = {}
+        # records of the strands of the last recorded generation, by sequence
+        self._latest = {}
+        self.current_generation = 0
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def _intern(self, value, ids, values):
+        idx = ids.get(value)
+        if idx is None:
+            idx = ids[value] = len(values)
+            values.append(value)
+        return idx
+
+    def add(self, strand_str, parent=NONE, enzyme_ops=None, generation=0):
+        """ Add a record, with the tuple of amino acid ops of the enzyme that made
+            it, and return its index """
+        self.sequence.append(self._intern(strand_str, self._sequence_ids, self.sequences))
+        self.parent.append(parent)
+        self.enzyme.append(NONE if enzyme_ops is None else self._intern(enzyme_ops, self._enzyme_ids, self.enzymes))
+        self.generation.append(generation)
+        return len(self.sequence) - 1
+
+    def record_generation(self, parent_strs, cycle_results):
+        """ Record the unique daughters of a generation, from the parent strand
+            strings and the (amino acid ops, daughter strand strings) of each of
+            their enzymes. Parents without a record are added as roots. Returns
+            the unique daughter strand strings, in order of first appearance. """
+        generation = self.current_generation + 1
+        latest = {}
+        daughters = []
+        for parent_str, enzyme_results in izip(parent_strs, cycle_results):
+            parent = self._latest.get(parent_str)
+            if parent is None:
+                parent = self._latest[parent_str] = self.add(parent_str, generation=self.current_generation)
+            for enzyme_ops, daughter_strs in enzyme_results:
+                for s in daughter_strs:
+                    if s not in latest:
+                        latest[s] = self.add(s, parent, enzyme_ops, generation)
+                        daughters.append(s)
+        self._latest = latest
+        self.current_generation = generation
+        return daughters
+
+    def sequence_of(self, record):
+        return self.sequences[self.sequence[record]]
+
+    def enzyme_of(self, record):
+        """ Amino acid ops of the enzyme that made a record, or None for a root """
+        enzyme = self.enzyme[record]
+        return None if enzyme == NONE else self.enzymes[enzyme]
+
+    def generation_of(self, record):
+        return self.generation[record]
+
+    def records_of(self, strand_str):
+        """ Indexes of all of the records of a sequence, oldest first """
+        sequence = self._sequence_ids.get(strand_str)
+        if sequence is None:
+            return []
+        return [record for record, s in enumerate(self.sequence) if s == sequence]
+
+    def ancestors(self, record):
+        """ Indexes of the record, its parent, and so on up to its root """
+        parent = self.parent
+        records = []
+        while record != NONE:
+            records.append(record)
+            record = parent[record]
+        return records
+
+    def common_ancestor(self, a, b):
+        """ Index of the most recent record both records descend from, or None """
+        ancestors = set(self.ancestors(a))
+        for record in self.ancestors(b):
+            if record in ancestors:
+                return record
+        return None
+
+    def save(self, path):
+        """ Write the records column by column: a JSON header line, the raw
+            column arrays, then the interned sequences and enzymes """
+        sequences = '\n'.join(self.sequences)
+        enzymes = '\n'.join(','.join(ops) for ops in self.enzymes)
+        header = {
+            'format': MAGIC,
+            'records': len(self),
+            'columns': [[name, getattr(self, name).typecode, getattr(self, name).itemsize] for name in COLUMNS],
+            'sequences': [len(self.sequences), len(sequences)],
+            'enzymes': [len(self.enzymes), len(enzymes)],
+            'current_generation': self.current_generation
+        }
+        with open(path, 'wb') as f:
+            f.write(json.dumps(header) + '\n')
+            for name in COLUMNS:
+                getattr(self, name).tofile(f)
+            f.write(sequences)
+            f.write(enzymes)
+
+    @classmethod
+    def load(cls, path):
+        lineage = cls()
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+            if header.get('format') != MAGIC:
+                raise ValueError('%s is not a saved lineage' % path)
+            for name, typecode, itemsize in header['columns']:
+                column = array(str(typecode))
+                if column.itemsize != itemsize:
+                    raise ValueError('Lineage %s was saved with a different integer size' % path)
+                column.fromfile(f, header['records'])
+                setattr(lineage, name, column)
+            count, size = header['sequences']
+            lineage.sequences = f.read(size).split('\n') if count else []
+            count, size = header['enzymes']
+            lineage.enzymes = [tuple(ops.split(',')) if ops else () for ops in f.read(size).split('\n')] if count else []
+        lineage._sequence_ids = dict((s, idx) for idx, s in enumerate(lineage.sequences))
+        lineage._enzyme_ids = dict((ops, idx) for idx, ops in enumerate(lineage.enzymes))
+        lineage.current_generation = header['current_generation']
+        generation = lineage.current_generation
+        lineage._latest = dict((lineage.sequence_of(record), record) for record in range(len(lineage))
+                               if lineage.generation[record] == generation)
+        return lineage
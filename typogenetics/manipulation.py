@@ -1,19 +1,27 @@
 from typogenetics.strand import Strand
 from typogenetics.enzyme import Enzyme
+from typogenetics.backend import core
 
 from collections import deque
-
-BASE_COMPLEMENT = {
-    'A': 'T', 'T': 'A',
-    'G': 'C', 'C': 'G'
-}
-PLACEHOLDER = '.'
-PURINES = ['A', 'G']
-PYRIMIDINES = ['C', 'T']
-
-
-class OutOfStrandException(Exception):
-    pass
+from timeit import default_timer
+
+# the array engine and the interpreter loop are in typogenetics._core, which
+# is compiled when built with Cython, see typogenetics.backend
+BASE_COMPLEMENT = core.BASE_COMPLEMENT
+PLACEHOLDER = core.PLACEHOLDER
+PURINES = core.PURINES
+PYRIMIDINES = core.PYRIMIDINES
+OutOfStrandException = core.OutOfStrandException
+EMPTY = core.EMPTY
+BYTE_COMPLEMENT = core.BYTE_COMPLEMENT
+PURINE_STOPS = core.PURINE_STOPS
+PYRIMIDINE_STOPS = core.PYRIMIDINE_STOPS
+SCAN_WINDOW = core.SCAN_WINDOW
+OUT_OF_STRAND = core.OUT_OF_STRAND
+find_nearest = core.find_nearest
+ArrayStrandBuffer = core.ArrayStrandBuffer
+ArrayStrandManipulationBuffer = core.ArrayStrandManipulationBuffer
+StatusArrayStrandManipulationBuffer = core.StatusArrayStrandManipulationBuffer
 
 
 class StrandBuffer(object):
@@ -62,6 +70,18 @@ class StrandManipulationBuffer(object):
         """
         getattr(self, operation)()
 
+    def cursor(self):
+        """ Position of the read slots, counted from the left of the primary strand """
+        return len(self.primary.left)
+
+    def seek(self, index):
+        """ Put the base at index into the read slots of a freshly loaded strand """
+        for buf in [self.primary, self.secondary]:
+            bases = [buf.bound] + list(buf.right)
+            buf.left = deque(bases[:index])
+            buf.bound = bases[index]
+            buf.right = deque(bases[index + 1:])
+
     def cut(self):
         # save the cut strands
         self.primary_strands.append(''.join([(c or PLACEHOLDER) for c in self.primary.right]))
@@ -160,18 +180,25 @@ class StrandManipulationBuffer(object):
     def int(self):
         self.insert('T')
 
+    def mvr_by(self, count):
+        for _ in range(count):
+            self.mvr()
+
+    def mvl_by(self, count):
+        for _ in range(count):
+            self.mvl()
+
     def repeated_move(self, direction, stop_condition):
-        def move(direction):
-            if direction == 'l':
-                self.mvl()
-            elif direction == 'r':
-                self.mvr()
-            else:
-                raise ValueError()
+        if direction == 'l':
+            move = self.mvl
+        elif direction == 'r':
+            move = self.mvr
+        else:
+            raise ValueError()
 
-        move(direction)
+        move()
         while(self.primary.bound not in stop_condition):
-            move(direction)
+            move()
         if self.copy_mode:
             self.secondary.bound = BASE_COMPLEMENT[self.primary.bound]
 
@@ -196,50 +223,179 @@ class StrandManipulationBuffer(object):
         return _str
 
 
-def apply_enzyme(strand, enzyme, verbose=False):
-    """ Apply specific enzymes on a strand """
+# amino acids whose consecutive runs are merged into a single move when compiling
+MOVE_RUNS = {'mvr': 'mvr_by', 'mvl': 'mvl_by'}
+
+
+class CompiledEnzyme(object):
+    """ An enzyme translated once into a program for a specific buffer class, so
+        that applying it to many strands skips the per-operation name lookups.
+        Runs of consecutive mvr or mvl are merged into a single move.
+
+        Example:
 
-    sm = StrandManipulationBuffer(strand.strand)
+        compiled = CompiledEnzyme(enzyme, ArrayStrandManipulationBuffer)
+        daughters = [apply_enzyme(strand, compiled) for strand in strands]
+    """
 
-    # find an initial binding pair
-    while(sm.primary.bound != enzyme.binding_preference):
-        try:
-            sm.mvr()
-        except OutOfStrandException:
-            # either couldn't find a binding partner or empty strand
-            # in both cases, just return the original strand
-            return [strand]
+    def __init__(self, enzyme, buffer_class=StrandManipulationBuffer):
+        self.binding_preference = enzyme.binding_preference
+        self.buffer_class = buffer_class
+        self.ops = tuple(amino_acid.op for amino_acid in enzyme.amino_acids)
+
+        # group the operations into (op, repeat count) runs
+        runs = []
+        for amino_acid in enzyme.amino_acids:
+            if runs and runs[-1][0] == amino_acid.op and amino_acid.op in MOVE_RUNS:
+                runs[-1][1] += 1
+            else:
+                runs.append([amino_acid.op, 1])
+
+        # each step of the program is (label, unbound method, arguments)
+        program = []
+        for op, count in runs:
+            label = '-'.join([op] * count)
+            if count > 1:
+                program.append((label, getattr(buffer_class, MOVE_RUNS[op]), (count,)))
+            else:
+                program.append((label, getattr(buffer_class, op), ()))
+        self.program = tuple(program)
+
+
+def apply_enzyme(strand, enzyme, verbose=False, buffer_class=StrandManipulationBuffer, observer=None):
+    """ Apply specific enzymes on a strand. The manipulation engine can be chosen
+        with buffer_class, either StrandManipulationBuffer or the faster
+        ArrayStrandManipulationBuffer. The enzyme can also be a CompiledEnzyme,
+        in which case its own buffer class is used. An observer, such as
+        instrumentation.OpStats, is told about the binding and every operation """
+
+    daughter_strs = apply_enzyme_to_str(strand.strand, enzyme, verbose, buffer_class, observer)
+    if daughter_strs is None:
+        # either couldn't find a binding partner or empty strand
+        # in both cases, just return the original strand
+        return [strand]
+
+    # the daughters are made of valid bases, so there is no need to check them again
+    return [Strand._create(s) for s in daughter_strs]
+
+
+def apply_enzyme_to_str(strand_str, enzyme, verbose=False, buffer_class=StrandManipulationBuffer, observer=None):
+    """ Same as apply_enzyme, but works on a valid, upper case strand string and
+        returns the daughter strand strings, or None when the enzyme doesn't bind """
+
+    if isinstance(enzyme, CompiledEnzyme):
+        buffer_class = enzyme.buffer_class
+        program = enzyme.program
+    else:
+        program = tuple((amino_acid.op, getattr(buffer_class, amino_acid.op), ())
+                        for amino_acid in enzyme.amino_acids)
+
+    # find the left-most binding site
+    site = strand_str.find(enzyme.binding_preference)
+    if site == -1:
+        if observer is not None:
+            observer.on_bind_failed(strand_str, enzyme)
+        return None
+
+    return _run_program(strand_str, site, program, buffer_class, verbose, observer)
+
+
+def _run_observed(sm, program, observer, verbose=False):
+    """ Same as the loop over the program in _run_program, telling the observer
+        about every operation. Merged runs of moves are run one move at a time,
+        so that the observer is told about as many moves as were executed
+        before running out of strand, whatever the program. """
+    for label, operation, args in program:
+        if args:
+            ops = label.split('-')
+            steps = [(getattr(type(sm), ops[0]), ())] * len(ops)
+        else:
+            ops = [label]
+            steps = [(operation, args)]
+        executed = 0
+        terminated = False
+        before = sm.cursor()
+        start = default_timer()
+        for operation, args in steps:
+            executed += 1
+            try:
+                terminated = bool(operation(sm, *args))
+            except OutOfStrandException:
+                terminated = True
+            if terminated:
+                break
+        elapsed_ns = int((default_timer() - start) * 1e9)
+        # swi changes which end the position is counted from, without moving
+        moved = 0 if label == 'swi' else abs(sm.cursor() - before)
+        label = '-'.join(ops[:executed])
+        observer.on_op(label, elapsed_ns, moved, terminated)
+        if verbose and not terminated:
+            print label
+            print sm
+        if terminated:
+            break
+
+
+def _run_program(strand_str, site, program, buffer_class, verbose=False, observer=None):
+    """ Bind the strand at site and run the enzyme program, returning the daughter strand strings """
+
+    sm = buffer_class(strand_str)
+    sm.seek(site)
+    if observer is not None:
+        observer.on_bind(strand_str, site)
 
     # log initial state, if desired
     if verbose:
         print sm
 
-    # apply the amino acid operations in order, unless we hit the end of a strand
-    for amino_acid in enzyme.amino_acids:
-        try:
-            # call operator
-            sm(amino_acid.op)
-            if verbose:
-                print amino_acid.op
+    # apply the amino acid operations in order, unless we hit the end of a strand,
+    # which operations either raise or return OUT_OF_STRAND for
+    if observer is not None:
+        _run_observed(sm, program, observer, verbose)
+    elif verbose:
+        for label, operation, args in program:
+            try:
+                # call operator
+                if operation(sm, *args):
+                    break
+                print label
                 print sm
-        except OutOfStrandException:
-            break
+            except OutOfStrandException:
+                break
+    else:
+        core.run_program(sm, program)
 
     # collect all of the strands
-    strands = []
     sm.primary_strands.append(sm.primary.dump())
     sm.secondary_strands.append(sm.secondary.dump())
+    strands = core.collect_strands(sm.primary_strands, sm.secondary_strands)
+    if observer is not None:
+        observer.on_done(strands)
+    return strands
 
-    for strand in sm.primary_strands:
-        for sub_strand in strand.split(PLACEHOLDER):  # in some cases there might be gaps, so split by the null placeholder
-            strands.append(sub_strand)
 
-    # the upper strands need to be reversed
-    for strand in sm.secondary_strands:
-        for sub_strand in strand.split(PLACEHOLDER):
-            strands.append(sub_strand[::-1])
+def find_binding_sites(strands, binding_preference):
+    """ Left-most binding site of each strand, or -1 where the enzyme can't bind """
+    return [strand.strand.find(binding_preference) for strand in strands]
 
-    # remove any empty strands/strings
-    strands = filter(lambda s: len(s), strands)
 
-    return [Strand(s) for s in strands]
+def apply_enzyme_batch(strands, enzyme, buffer_class=StrandManipulationBuffer, observer=None):
+    """ Apply one enzyme to each of the strands. The enzyme is compiled once and the
+        binding sites of all the strands are found up front, so only the amino acid
+        program is run per strand. Returns a list of daughter strand lists, in the
+        same order as strands. """
+
+    if not isinstance(enzyme, CompiledEnzyme):
+        enzyme = CompiledEnzyme(enzyme, buffer_class)
+
+    results = []
+    for strand, site in zip(strands, find_binding_sites(strands, enzyme.binding_preference)):
+        if site == -1:
+            if observer is not None:
+                observer.on_bind_failed(strand.strand, enzyme)
+            results.append([strand])
+        else:
+            daughter_strs = _run_program(strand.strand, site, enzyme.program, enzyme.buffer_class,
+                                         observer=observer)
+            results.append([Strand._create(s) for s in daughter_strs])
+    return results
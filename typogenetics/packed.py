@@ -0,0 +1,115 @@
+from typogenetics.strand import Strand, BASES, _check_input
+
+from string import maketrans
+
+# bases are packed 4 to a byte, first base in the high bits, using the codes
+# A=0, C=1, G=2, T=3 so that complementing a base is flipping both of its bits
+BASES_PER_BYTE = 4
+_PACK = {}
+_UNPACK = []
+for _code in range(256):
+    _bases = ''.join(BASES[(_code >> shift) & 3] for shift in [6, 4, 2, 0])
+    _PACK[_bases] = chr(_code)
+    _UNPACK.append(_bases)
+
+_ALL_BYTES = ''.join(chr(code) for code in range(256))
+_BYTE_COMPLEMENT = maketrans(_ALL_BYTES, ''.join(chr(code ^ 0xFF) for code in range(256)))
+_BYTE_REVERSE = maketrans(_ALL_BYTES, ''.join(_PACK[bases[::-1]] for bases in _UNPACK))
+
+COMPLEMENT_TABLE = maketrans('ACGT', 'TGCA')
+
+
+def complement(strand_str):
+    """ Complement every base of a strand string """
+    return strand_str.translate(COMPLEMENT_TABLE)
+
+
+def reverse_complement(strand_str):
+    """ Complement of a strand string, read in the opposite direction """
+    return strand_str[::-1].translate(COMPLEMENT_TABLE)
+
+
+def pack(strand_str):
+    """ Pack a valid, upper case strand string into 2 bits per base. The last
+        byte is padded with zero bits """
+    padded = strand_str + 'A' * (-len(strand_str) % BASES_PER_BYTE)
+    return ''.join([_PACK[padded[idx:idx + BASES_PER_BYTE]] for idx in range(0, len(padded), BASES_PER_BYTE)])
+
+
+def unpack(data, length):
+    """ Unpack the first length bases of packed data into a strand string """
+    return ''.join(map(_UNPACK.__getitem__, bytearray(data)))[:length]
+
+
+def _clear_padding(data, length):
+    """ Zero the unused bits of the last byte """
+    padding = -length % BASES_PER_BYTE
+    if not padding:
+        return data
+    return data[:-1] + chr(ord(data[-1]) & (0xFF << (2 * padding)) & 0xFF)
+
+
+class PackedStrand(object):
+    """ Compact, immutable strand that stores its sequence at 2 bits per base.
+
+        Example:
+
+        packed = PackedStrand.from_str('TAGATCCAGTCCACTCGA')
+        packed.reverse_complement().to_strand()
+    """
+
+    __slots__ = ('_data', '_length')
+
+    def __init__(self, data, length):
+        """ Wrap already packed data, a str or a read-only buffer such as a view
+            of a memory map, see from_str for packing a strand string """
+        self._data = data
+        self._length = length
+
+    @classmethod
+    def from_str(cls, strand_str):
+        return cls(pack(_check_input(strand_str).upper()), len(strand_str))
+
+    @classmethod
+    def from_strand(cls, strand):
+        return cls(pack(strand.strand), len(strand.strand))
+
+    @property
+    def data(self):
+        return self._data
+
+    def __len__(self):
+        return self._length
+
+    def to_str(self):
+        return unpack(self._data, self._length)
+
+    def to_strand(self):
+        return Strand(self.to_str())
+
+    def complement(self):
+        return PackedStrand(_clear_padding(str(self._data).translate(_BYTE_COMPLEMENT), self._length), self._length)
+
+    def reverse(self):
+        if self._length % BASES_PER_BYTE:
+            # the padding would end up at the front, so go through the string form
+            return PackedStrand(pack(self.to_str()[::-1]), self._length)
+        return PackedStrand(str(self._data)[::-1].translate(_BYTE_REVERSE), self._length)
+
+    def reverse_complement(self):
+        return self.reverse().complement()
+
+    def __eq__(self, other):
+        return isinstance(other, PackedStrand) and self._length == other._length and str(self._data) == str(other._data)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self._length, str(self._data)))
+
+    def __reduce__(self):
+        return (PackedStrand, (str(self._data), self._length))
+
+    def __str__(self):
+        return "%s(%s)" % (self.__class__.__name__, self.to_str())
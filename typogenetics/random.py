@@ -0,0 +1,139 @@
+""" Seeded, reproducible bulk generation of random strands and enzymes.
+
+The modules of this package that use the standard library random module
+import it with absolute_import, as this module would shadow it otherwise. """
+
+from __future__ import absolute_import
+
+from typogenetics.strand import Strand, BASES
+from typogenetics.amino_acid import AminoAcid, AMINO_ACIDS
+from typogenetics.enzyme import Enzyme
+from typogenetics.packed import PackedStrand, pack, _clear_padding, BASES_PER_BYTE
+
+from string import maketrans
+import binascii
+import hashlib
+import random
+
+# the amino acids that enzymes are made of, punctuation only separates enzymes
+ENZYME_AMINO_ACIDS = AMINO_ACIDS[1:]
+_ALL_BYTES = ''.join(chr(code) for code in range(256))
+
+
+def _stream_seed(seed, stream):
+    """ Seed of an independent stream, derived from the seed and stream number """
+    return long(hashlib.sha1('%s:%d' % (seed, stream)).hexdigest(), 16)
+
+
+def _composition_table(composition):
+    """ Translation table from random bytes to bases, with each base taking a
+        share of the 256 byte values in proportion to its weight """
+    weights = [float(composition.get(base, 0)) for base in BASES]
+    total = sum(weights)
+    if total <= 0 or min(weights) < 0:
+        raise ValueError('Base composition needs non-negative weights for %s' % ', '.join(BASES))
+    bases = []
+    cumulative = 0.0
+    for base, weight in zip(BASES, weights):
+        cumulative += weight
+        bases.append(base * (int(round(cumulative / total * 256)) - len(''.join(bases))))
+    return maketrans(_ALL_BYTES, ''.join(bases))
+
+
+def gc_composition(gc):
+    """ Base composition with a fraction gc of G and C """
+    return {'A': 1.0 - gc, 'T': 1.0 - gc, 'G': gc, 'C': gc}
+
+
+class RandomGenerator(object):
+    """ Generator of random strands and enzymes. The output only depends on
+        the seed and the stream number, so parallel workers each given their own
+        stream of the same seed produce reproducible, independent output.
+
+        Strand lengths are drawn from lengths: a fixed length, a (min, max)
+        range, or a function of a random.Random. The bases follow composition,
+        a dict of weights per base (uniform by default, resolved to 1/256).
+        Strands are generated in bulk and never validated again.
+
+        Example:
+
+        rng = RandomGenerator(seed=0, lengths=(10, 100), composition=gc_composition(0.6))
+        population = rng.strands(10000)
+        worker_rngs = [rng.stream(worker) for worker in range(8)]
+    """
+
+    def __init__(self, seed=None, stream=0, lengths=(1, 100), composition=None, enzyme_lengths=(1, 10)):
+        self.seed = seed
+        self.stream_number = stream
+        self.lengths = lengths
+        self.composition = composition
+        self.enzyme_lengths = enzyme_lengths
+        self.rng = random.Random(_stream_seed(seed, stream) if seed is not None else None)
+        self._table = _composition_table(composition) if composition is not None else None
+
+    def stream(self, stream):
+        """ Generator with the same settings, for another stream of the seed """
+        return RandomGenerator(self.seed, stream, self.lengths, self.composition, self.enzyme_lengths)
+
+    def _length(self, lengths):
+        if callable(lengths):
+            return lengths(self.rng)
+        if isinstance(lengths, tuple):
+            return self.rng.randint(*lengths)
+        return lengths
+
+    def _random_bytes(self, count):
+        if not count:
+            return ''
+        return binascii.unhexlify('%0*x' % (2 * count, self.rng.getrandbits(8 * count)))
+
+    def _bases(self, count):
+        """ A string of count random bases """
+        if self._table is None:
+            # 4 uniform random bases per random byte
+            data = self._random_bytes((count + BASES_PER_BYTE - 1) // BASES_PER_BYTE)
+            return PackedStrand(data, count).to_str()
+        return self._random_bytes(count).translate(self._table)
+
+    def _lengths(self, count, lengths):
+        lengths = self.lengths if lengths is None else lengths
+        return [self._length(lengths) for _ in range(count)]
+
+    def _strand_strs(self, lengths):
+        bases = self._bases(sum(lengths))
+        strand_strs = []
+        start = 0
+        for length in lengths:
+            strand_strs.append(bases[start:start + length])
+            start += length
+        return strand_strs
+
+    def strand_strs(self, count, lengths=None):
+        """ count random strand strings """
+        return self._strand_strs(self._lengths(count, lengths))
+
+    def strands(self, count, lengths=None):
+        """ count random Strands """
+        return [Strand._create(s) for s in self.strand_strs(count, lengths)]
+
+    def packed_strands(self, count, lengths=None):
+        """ count random PackedStrands. With the uniform composition, the random
+            bytes are used as packed data directly. """
+        lengths = self._lengths(count, lengths)
+        if self._table is not None:
+            return [PackedStrand(pack(s), len(s)) for s in self._strand_strs(lengths)]
+        packed = []
+        for length in lengths:
+            data = self._random_bytes((length + BASES_PER_BYTE - 1) // BASES_PER_BYTE)
+            packed.append(PackedStrand(_clear_padding(data, length) if data else data, length))
+        return packed
+
+    def enzymes(self, count, lengths=None):
+        """ count random Enzymes, of amino acids other than punctuation """
+        choice = self.rng.choice
+        amino_acids = [AminoAcid(op) for op in ENZYME_AMINO_ACIDS]
+        enzymes = []
+        for _ in range(count):
+            length = self._length(self.enzyme_lengths if lengths is None else lengths)
+            enzymes.append(Enzyme._create(tuple(choice(amino_acids) for _ in range(length))))
+        return enzymes
@@ -1,5 +1,7 @@
 from typogenetics.enzyme import Enzyme
-from typogenetics.amino_acid import AminoAcid
+from typogenetics.amino_acid import AminoAcid, OPCODES
+from typogenetics.enzyme import opcodes_binding_preference
+from typogenetics.backend import core
 
 TYPOGENETIC_CODE = {
     'AA': 'pun', 'AC': 'cut', 'AG': 'delete', 'AT': 'swi',
@@ -8,26 +10,23 @@ TYPOGENETIC_CODE = {
     'TA': 'rpy', 'TC': 'rpu', 'TG': 'lpy',    'TT': 'lpu'
 }
 
+PUNCTUATION = OPCODES['pun']
+_PAIR_TO_OPCODE = dict((pair, OPCODES[op]) for pair, op in TYPOGENETIC_CODE.items())
+_OPCODE_TO_AMINO_ACID = dict((opcode, AminoAcid(op)) for op, opcode in OPCODES.items())
 
-def strand_to_enzymes(strand):
-    """ Tranlate the strand encoding to enzymes via ribosomes """
 
-    def chunk_strand(strand):
-        for idx in range(len(strand) / 2):
-            yield strand[idx * 2:idx * 2 + 2]
+def strand_to_opcodes(strand):
+    """ Translate the strand into a string with one opcode per base pair """
+    return core.translate_pairs(strand.strand, _PAIR_TO_OPCODE)
 
-    # translate the chunks to amino acids or punctuation
-    amino_acids = [AminoAcid(TYPOGENETIC_CODE[chunk]) for chunk in chunk_strand(strand.strand)]
 
-    enzymes = []
-    current_enzyme = []
-    for amino_acid in amino_acids:
-        # if there is an AA chunk present, we finish off the current enzyme and start a new one
-        if amino_acid.op == 'pun':
-            enzymes.append(Enzyme(current_enzyme))
-            current_enzyme = []
-        else:
-            current_enzyme.append(amino_acid)
-    enzymes.append(Enzyme(current_enzyme))
+def strand_to_enzymes(strand):
+    """ Tranlate the strand encoding to enzymes via ribosomes """
 
-    return filter(lambda e: len(e.amino_acids), enzymes)  # filter out any empty enzyimes
+    enzymes = []
+    # every AA pair finishes off the current enzyme and starts a new one
+    for opcodes in strand_to_opcodes(strand).split(PUNCTUATION):
+        if opcodes:  # filter out any empty enzymes
+            enzymes.append(Enzyme._create(tuple(map(_OPCODE_TO_AMINO_ACID.__getitem__, opcodes)),
+                                          opcodes_binding_preference(opcodes)))
+    return enzymes
@@ -0,0 +1,198 @@
+from __future__ import absolute_import
+
+from typogenetics.strand import Strand, BASES
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import apply_enzyme_to_str, ArrayStrandManipulationBuffer
+from typogenetics.cache import LRUCache
+
+from collections import namedtuple
+from functools import partial
+from itertools import product
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+
+# kinds of strands found by the search
+INERT = 'inert'                      # none of its enzymes can bind, so it only gives copies of itself
+FIXED_POINT = 'fixed_point'          # every daughter is the strand itself
+SELF_REPRODUCER = 'self_reproducer'  # at least two of the daughters are the strand itself
+SELF_PRODUCER = 'self_producer'      # one of the daughters is the strand itself
+CYCLE = 'cycle'                      # the population it grows into comes back to an earlier one
+KINDS = [INERT, FIXED_POINT, SELF_REPRODUCER, SELF_PRODUCER, CYCLE]
+
+# the number of bases enumerated inside each unit of work
+UNIT_SUFFIX_LENGTH = 6
+
+Hit = namedtuple('Hit', ['strand', 'kind', 'start', 'period'])
+
+# daughters of the strands seen by this process, shared by all the searches it runs
+_daughters_cache = LRUCache(max_size=200000)
+
+
+def daughters_of(strand_str, buffer_class=ArrayStrandManipulationBuffer):
+    """ Daughter strand strings of one cycle, as a tuple, and whether any of the
+        strand's enzymes could bind to it. Memoized per process. """
+    key = (strand_str, buffer_class)
+    result = _daughters_cache.get(key)
+    if result is None:
+        daughters = []
+        bound = False
+        for enzyme in strand_to_enzymes(Strand._create(strand_str)):
+            daughter_strs = apply_enzyme_to_str(strand_str, enzyme, buffer_class=buffer_class)
+            if daughter_strs is None:
+                daughters.append(strand_str)
+            else:
+                bound = True
+                daughters.extend(daughter_strs)
+        result = (tuple(daughters), bound)
+        _daughters_cache.put(key, result)
+    return result
+
+
+def canonical_key(strand_strs):
+    """ Compact hash of a multiset of strand strings, independent of their order """
+    return hashlib.sha1('\n'.join(sorted(strand_strs))).digest()
+
+
+def find_cycle(strand_str, generations, population_cap=64, buffer_class=ArrayStrandManipulationBuffer):
+    """ Follow the population grown from a single strand, keeping the unique
+        daughters of each generation, for up to generations cycles. Returns the
+        (start, period) of the first repeated population, or None when there is
+        none, the population dies out or grows past population_cap. """
+    population = frozenset([strand_str])
+    seen = {canonical_key(population): 0}
+    for generation in range(1, generations + 1):
+        daughters = set()
+        for s in population:
+            daughters.update(daughters_of(s, buffer_class)[0])
+        if not daughters or len(daughters) > population_cap:
+            return None
+        population = frozenset(daughters)
+        key = canonical_key(population)
+        if key in seen:
+            return seen[key], generation - seen[key]
+        seen[key] = generation
+    return None
+
+
+def classify(strand_str, generations=0, population_cap=64, buffer_class=ArrayStrandManipulationBuffer):
+    """ Kind of a strand, see KINDS, as a Hit, or None when it's none of them.
+        Cycles are only looked for with a number of generations. """
+    daughters, bound = daughters_of(strand_str, buffer_class)
+    if not daughters:
+        return None
+    if not bound:
+        return Hit(strand_str, INERT, 0, 1)
+
+    copies = daughters.count(strand_str)
+    if copies == len(daughters):
+        return Hit(strand_str, FIXED_POINT, 0, 1)
+    if copies >= 2:
+        return Hit(strand_str, SELF_REPRODUCER, 0, 1)
+    if copies == 1:
+        return Hit(strand_str, SELF_PRODUCER, 0, 1)
+
+    if generations:
+        found = find_cycle(strand_str, generations, population_cap, buffer_class)
+        if found is not None:
+            return Hit(strand_str, CYCLE, found[0], found[1])
+    return None
+
+
+def _units(min_length, max_length):
+    """ Units of work for enumerating all of the strands: (prefix, suffix length) """
+    for length in range(min_length, max_length + 1):
+        suffix_length = min(length, UNIT_SUFFIX_LENGTH)
+        for prefix in product(BASES, repeat=length - suffix_length):
+            yield ''.join(prefix), suffix_length
+
+
+def _sample_units(samples, min_length, max_length):
+    """ Units of work for drawing samples random strands: (unit number, number
+        of strands, strand length range) """
+    sample_size = 4 ** UNIT_SUFFIX_LENGTH
+    for number, start in enumerate(range(0, samples, sample_size)):
+        yield number, min(sample_size, samples - start), (min_length, max_length)
+
+
+def _search_unit(unit, kinds, generations, population_cap, buffer_class, sampled, seed):
+    """ Worker task: classify the strands of a unit and return the interesting ones """
+    if sampled:
+        number, count, (min_length, max_length) = unit
+        rng = random.Random(seed * 1000003 + number)
+        strand_strs = (''.join(rng.choice(BASES) for _ in range(rng.randint(min_length, max_length)))
+                       for _ in range(count))
+    else:
+        prefix, suffix_length = unit
+        strand_strs = (prefix + ''.join(suffix) for suffix in product(BASES, repeat=suffix_length))
+
+    hits = []
+    for strand_str in strand_strs:
+        hit = classify(strand_str, generations, population_cap, buffer_class)
+        if hit is not None and hit.kind in kinds:
+            hits.append(hit)
+    return hits
+
+
+def _save_checkpoint(path, params, done, hits):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'params': params, 'done': done, 'hits': [list(hit) for hit in hits]}, f)
+    os.rename(tmp_path, path)
+
+
+def search(max_length, min_length=1, kinds=(FIXED_POINT, SELF_REPRODUCER, SELF_PRODUCER, CYCLE),
+           generations=0, population_cap=64, samples=None, seed=0, processes=None, checkpoint=None,
+           buffer_class=ArrayStrandManipulationBuffer):
+    """ Search the strands of min_length to max_length bases for the given kinds
+        of strands (see KINDS). All of the strands are enumerated, or when samples
+        is given, that many random strands are drawn with the seed. Cycles are
+        looked for over a number of generations.
+
+        The work is spread over a pool of processes (all CPUs by default, or run
+        in this process when processes=1) in units of a few thousand strands.
+        With a checkpoint path, progress is saved after every unit and an
+        interrupted search with the same parameters resumes from it. Returns the
+        list of Hits, in enumeration order.
+
+        Example:
+
+        for hit in search(8, generations=10):
+            print hit.strand, hit.kind
+    """
+    kinds = tuple(kinds)
+    if samples:
+        units = list(_sample_units(samples, min_length, max_length))
+    else:
+        units = list(_units(min_length, max_length))
+
+    params = {'max_length': max_length, 'min_length': min_length, 'kinds': list(kinds),
+              'generations': generations, 'population_cap': population_cap, 'samples': samples,
+              'seed': seed, 'buffer_class': buffer_class.__name__}
+    done = 0
+    hits = []
+    if checkpoint is not None and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            saved = json.load(f)
+        if saved['params'] != params:
+            raise ValueError('Checkpoint %s was saved for a different search' % checkpoint)
+        done = saved['done']
+        hits = [Hit(*hit) for hit in saved['hits']]
+
+    task = partial(_search_unit, kinds=kinds, generations=generations, population_cap=population_cap,
+                   buffer_class=buffer_class, sampled=bool(samples), seed=seed)
+    pool = None if processes == 1 else multiprocessing.Pool(processes)
+    try:
+        remaining = units[done:]
+        results = pool.imap(task, remaining) if pool is not None else (task(unit) for unit in remaining)
+        for unit_hits in results:
+            hits.extend(Hit(str(hit.strand), str(hit.kind), hit.start, hit.period) for hit in unit_hits)
+            done += 1
+            if checkpoint is not None:
+                _save_checkpoint(checkpoint, params, done, hits)
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return hits
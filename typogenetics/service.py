@@ -0,0 +1,460 @@
+""" Local typogenetics server, so that many light client processes can share one
+warmed up engine, its worker processes and its result cache.
+
+Requests and responses are JSON objects, one per line:
+
+    {"id": 1, "method": "apply_enzyme", "params": {"strand": "CATG", "enzyme": ["cop", "mvr"]}}
+    {"id": 1, "result": ["CATG", "TA"]}
+
+The methods are strand_to_enzymes (enzymes as lists of amino acid ops), apply_enzyme
+(daughter strand strings), cycle (daughter strand strings of a whole cycle) and
+stats. Responses can come back in a different order than the requests, and are
+matched to them by id.
+
+Start a server with:
+
+    python -m typogenetics.service --socket /tmp/typogenetics.sock
+"""
+
+from typogenetics.strand import Strand, InvalidStrand
+from typogenetics.amino_acid import AminoAcid, InvalidAminoAcid
+from typogenetics.enzyme import Enzyme
+from typogenetics.ribosomes import strand_to_enzymes
+from typogenetics.manipulation import ArrayStrandManipulationBuffer
+from typogenetics.evolve import cycle_str, _enzyme_daughters, _chunks
+from typogenetics.cache import LRUCache, enzyme_key
+
+from collections import OrderedDict
+from functools import partial
+import argparse
+import json
+import multiprocessing
+import os
+import Queue
+import socket
+import SocketServer
+import stat
+import threading
+import time
+
+METHODS = ['strand_to_enzymes', 'apply_enzyme', 'cycle', 'stats']
+# the most requests evaluated together, and how long to wait for more of them
+BATCH_SIZE = 512
+BATCH_DELAY = 0.002
+# requests waiting for a batch, beyond which connections stop being read
+QUEUE_SIZE = 4096
+# requests sent to a worker process at a time
+CHUNK_SIZE = 64
+
+
+class ServiceError(Exception):
+    pass
+
+
+def request_key(method, params):
+    """ Validate the params of a request, returning its hashable cache key """
+    if method not in METHODS or method == 'stats':
+        raise ServiceError('Unknown method: %s' % method)
+    try:
+        strand_str = Strand(str(params['strand'])).strand
+        if method != 'apply_enzyme':
+            return method, strand_str
+        if not isinstance(params['enzyme'], list):
+            raise ServiceError('enzyme must be a list of amino acids')
+        return method, strand_str, tuple(AminoAcid(str(op)).op for op in params['enzyme'])
+    except (InvalidStrand, InvalidAminoAcid) as e:
+        raise ServiceError(str(e))
+    except (KeyError, TypeError, UnicodeError) as e:
+        raise ServiceError('Missing or invalid params: %s' % e)
+
+
+def evaluate(key, buffer_class=ArrayStrandManipulationBuffer):
+    """ Result of a request, by its key """
+    method, strand_str = key[:2]
+    if method == 'strand_to_enzymes':
+        return [[amino_acid.op for amino_acid in enzyme.amino_acids]
+                for enzyme in strand_to_enzymes(Strand._create(strand_str))]
+    if method == 'apply_enzyme':
+        enzyme = Enzyme._create(tuple(AminoAcid(op) for op in key[2]))
+        return _enzyme_daughters(strand_str, enzyme, buffer_class)
+    return cycle_str(strand_str, buffer_class)
+
+
+def _evaluate_chunk(keys, buffer_class):
+    """ Worker task: evaluate a chunk of requests """
+    return [evaluate(key, buffer_class) for key in keys]
+
+
+class Batcher(object):
+    """ Collects the requests of all of the connections into batches, answers
+        what it can from the cache and evaluates the rest on a pool of processes
+        (all CPUs by default, or in this process when processes=1). submit blocks
+        while queue_size requests are waiting, which holds back the clients.
+    """
+
+    def __init__(self, processes=None, batch_size=BATCH_SIZE, batch_delay=BATCH_DELAY, queue_size=QUEUE_SIZE,
+                 cache_size=100000, buffer_class=ArrayStrandManipulationBuffer):
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.queue = Queue.Queue(queue_size)
+        self.cache = LRUCache(cache_size)
+        self.task = partial(_evaluate_chunk, buffer_class=buffer_class)
+        self.pool = None if processes == 1 else multiprocessing.Pool(processes)
+        self.requests = 0
+        self.batches = 0
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def submit(self, key, callback):
+        """ Queue a request, callback(result, error) is called from the batching thread """
+        self.queue.put((key, callback))
+
+    def close(self):
+        """ Answer the queued requests, then stop """
+        self.queue.put(None)
+        self.thread.join()
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'cache_size': len(self.cache),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses
+        }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            batch = []
+            deadline = time.time() + self.batch_delay
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except Queue.Empty:
+                    break
+            stopping = item is None
+            if batch:
+                self._process(batch)
+
+    def _process(self, batch):
+        self.requests += len(batch)
+        self.batches += 1
+        # requests for the same key in a batch are evaluated once
+        pending = OrderedDict()
+        for key, callback in batch:
+            result = self.cache.get(key)
+            if result is None:
+                pending.setdefault(key, []).append(callback)
+            else:
+                callback(result, None)
+
+        keys = list(pending)
+        try:
+            if self.pool is None:
+                results = self.task(keys)
+            else:
+                results = [value for chunk_results in self.pool.map(self.task, _chunks(keys, CHUNK_SIZE))
+                           for value in chunk_results]
+        except Exception as e:
+            for callbacks in pending.values():
+                for callback in callbacks:
+                    callback(None, 'Evaluation failed: %s' % e)
+            return
+
+        for key, result in zip(keys, results):
+            self.cache.put(key, result)
+            for callback in pending[key]:
+                callback(result, None)
+
+
+class _RequestHandler(SocketServer.StreamRequestHandler):
+    """ Reads the requests of a connection, while a writer thread of its own
+        writes their responses as the batches complete, so that a client that
+        is slow to read only holds back itself. Stops reading while QUEUE_SIZE
+        responses are waiting to be written, and waits for all of them before
+        closing. """
+
+    def handle(self):
+        done = threading.Condition(threading.Lock())
+        outstanding = [0]
+        responses = Queue.Queue()
+
+        def respond(request_id, result, error):
+            # called from the batching thread, so it must not block
+            response = {'id': request_id}
+            if error is None:
+                response['result'] = result
+            else:
+                response['error'] = error
+            responses.put(json.dumps(response) + '\n')
+
+        def write_responses():
+            connected = True
+            while True:
+                line = responses.get()
+                if line is None:
+                    break
+                if connected:
+                    try:
+                        self.wfile.write(line)
+                        self.wfile.flush()
+                    except socket.error:
+                        # the client went away, the remaining responses are dropped
+                        connected = False
+                with done:
+                    outstanding[0] -= 1
+                    done.notify()
+
+        writer = threading.Thread(target=write_responses)
+        writer.daemon = True
+        writer.start()
+
+        batcher = self.server.batcher
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            with done:
+                while outstanding[0] >= QUEUE_SIZE:
+                    done.wait()
+                outstanding[0] += 1
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get('id')
+                method = request.get('method')
+                if method == 'stats':
+                    respond(request_id, batcher.stats(), None)
+                else:
+                    batcher.submit(request_key(method, request.get('params') or {}),
+                                   partial(respond, request_id))
+            except (ValueError, AttributeError, ServiceError) as e:
+                respond(request_id, None, str(e) or 'Invalid request')
+
+        with done:
+            while outstanding[0]:
+                done.wait()
+        responses.put(None)
+        writer.join()
+
+    def finish(self):
+        try:
+            SocketServer.StreamRequestHandler.finish(self)
+        except socket.error:
+            # the client went away
+            pass
+
+
+def _is_socket(path):
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+class _UnixServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class TypogeneticsService(object):
+    """ Server on a Unix socket (address is a path) or a localhost TCP socket
+        (address is a (host, port) tuple, port 0 picks a free one). The address
+        it listens on is in the address attribute. Keyword arguments go to the
+        Batcher.
+
+        Example:
+
+        with TypogeneticsService('/tmp/typogenetics.sock') as service:
+            service.serve_forever()
+    """
+
+    def __init__(self, address, **batcher_args):
+        if isinstance(address, basestring):
+            if _is_socket(address):
+                # left behind by a server that didn't close
+                os.unlink(address)
+            elif os.path.exists(address):
+                raise ServiceError('%s exists and is not a socket' % address)
+            self.server = _UnixServer(address, _RequestHandler)
+        else:
+            self.server = _TCPServer(tuple(address), _RequestHandler)
+        self.address = self.server.server_address
+        # the worker processes are forked before any other thread is started
+        self.server.batcher = Batcher(**batcher_args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def start(self):
+        """ Serve from a background thread """
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        """ Stop serve_forever, from another thread """
+        self.server.shutdown()
+
+    def close(self):
+        self.server.server_close()
+        self.server.batcher.close()
+        if isinstance(self.address, basestring) and _is_socket(self.address):
+            os.unlink(self.address)
+
+
+class PendingResponse(object):
+    """ Result of a request submitted with ServiceClient.submit """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._result = None
+        self._error = None
+
+    def done(self):
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """ Wait for the response, raising ServiceError when the request failed """
+        if not self._event.wait(timeout):
+            raise ServiceError('No response within %s seconds' % timeout)
+        if self._error is not None:
+            raise ServiceError(self._error)
+        return self._result
+
+    def _set(self, result, error):
+        self._result = result
+        self._error = error
+        self._event.set()
+
+
+class ServiceClient(object):
+    """ Client of a TypogeneticsService. submit sends a request without waiting
+        for its response, so many requests can be in flight on one connection
+        and get batched together by the server; the other methods wait.
+
+        Example:
+
+        with ServiceClient('/tmp/typogenetics.sock') as client:
+            pending = [client.submit('cycle', strand=s) for s in strand_strs]
+            daughters = [p.result() for p in pending]
+    """
+
+    def __init__(self, address):
+        if isinstance(address, basestring):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.connect(address)
+        self.wfile = self.sock.makefile('wb')
+        self.rfile = self.sock.makefile('rb')
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.next_id = 0
+        self.reader = threading.Thread(target=self._read_responses)
+        self.reader.daemon = True
+        self.reader.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_WR)
+        except socket.error:
+            pass
+        self.reader.join()
+        self.wfile.close()
+        self.rfile.close()
+        self.sock.close()
+
+    def submit(self, method, **params):
+        """ Send a request, returning a PendingResponse """
+        pending = PendingResponse()
+        with self.lock:
+            self.next_id += 1
+            request_id = self.next_id
+            self.pending[request_id] = pending
+            self.wfile.write(json.dumps({'id': request_id, 'method': method, 'params': params}) + '\n')
+            self.wfile.flush()
+        return pending
+
+    def _read_responses(self):
+        for line in iter(self.rfile.readline, ''):
+            response = json.loads(line)
+            with self.lock:
+                pending = self.pending.pop(response['id'])
+            pending._set(response.get('result'), response.get('error'))
+        # the connection is closed, fail anything still waiting
+        with self.lock:
+            for pending in self.pending.values():
+                pending._set(None, 'Connection closed')
+            self.pending.clear()
+
+    def strand_to_enzymes(self, strand):
+        ops = self.submit('strand_to_enzymes', strand=getattr(strand, 'strand', strand)).result()
+        return [Enzyme._create(tuple(AminoAcid(str(op)) for op in enzyme_ops)) for enzyme_ops in ops]
+
+    def apply_enzyme(self, strand, enzyme):
+        """ Daughter strands of applying an Enzyme, or list of amino acid ops """
+        ops = enzyme if isinstance(enzyme, list) else list(enzyme_key(enzyme))
+        result = self.submit('apply_enzyme', strand=getattr(strand, 'strand', strand), enzyme=ops).result()
+        return [Strand._create(str(s)) for s in result]
+
+    def cycle(self, strand):
+        result = self.submit('cycle', strand=getattr(strand, 'strand', strand)).result()
+        return [Strand._create(str(s)) for s in result]
+
+    def stats(self):
+        return self.submit('stats').result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m typogenetics.service', description=__doc__.splitlines()[0])
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--socket', help='Unix socket path to listen on')
+    group.add_argument('--port', type=int, help='localhost TCP port to listen on')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: all CPUs)')
+    parser.add_argument('--cache-size', type=int, default=100000, help='results kept in the cache')
+    args = parser.parse_args(argv)
+
+    address = args.socket if args.socket else ('127.0.0.1', args.port)
+    try:
+        service = TypogeneticsService(address, processes=args.processes, cache_size=args.cache_size)
+    except ServiceError as e:
+        parser.exit(1, '%s: error: %s\n' % (parser.prog, e))
+    with service:
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+from typogenetics.strand import Strand
+from typogenetics.packed import PackedStrand, pack, unpack, BASES_PER_BYTE
+
+import mmap
+import os
+import struct
+
+# one index record per strand: byte offset of its packed sequence in the data
+# file, its number of bases and its generation
+INDEX_RECORD = struct.Struct('<QII')
+APPEND_BATCH_SIZE = 4096
+
+
+def _map(f):
+    """ Read-only memory map of a whole file, or None for an empty file """
+    size = os.fstat(f.fileno()).st_size
+    if not size:
+        return None
+    return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+
+class PopulationStore(object):
+    """ Append-only, on-disk store of the strands of successive generations.
+        The sequences are packed at 2 bits per base in path + '.seq', and
+        path + '.idx' holds a fixed size record per strand. Both files are
+        memory mapped for reading, so opening an existing store is instant and
+        populations larger than memory can be accessed by index.
+
+        Example:
+
+        with PopulationStore('run') as store:
+            for generation, population in evolve(population, 100):
+                store.append(population, generation)
+
+        with PopulationStore('run') as store:
+            population = list(store.generation(store.last_generation()))
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._data = open(path + '.seq', 'a+b')
+        self._index = open(path + '.idx', 'a+b')
+        self._length = os.fstat(self._index.fileno()).st_size // INDEX_RECORD.size
+        self._data_size = self._recover()
+        self._data_map = None
+        self._index_map = None
+
+    def _recover(self):
+        """ Truncate whatever an interrupted append left past the last complete
+            index record and the sequence it points to, so that new records
+            are written right after them. Returns the size of the data file. """
+        self._index.truncate(self._length * INDEX_RECORD.size)
+        data_size = 0
+        if self._length:
+            self._index.seek((self._length - 1) * INDEX_RECORD.size)
+            offset, length, generation = INDEX_RECORD.unpack(self._index.read(INDEX_RECORD.size))
+            data_size = offset + (length + BASES_PER_BYTE - 1) // BASES_PER_BYTE
+        self._data.truncate(data_size)
+        return data_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._unmap()
+        self._data.close()
+        self._index.close()
+
+    def _unmap(self):
+        for m in [self._data_map, self._index_map]:
+            if m is not None:
+                m.close()
+        self._data_map = None
+        self._index_map = None
+
+    def _record(self, idx):
+        if self._index_map is None:
+            self._index_map = _map(self._index)
+            self._data_map = _map(self._data)
+        return INDEX_RECORD.unpack_from(self._index_map, idx * INDEX_RECORD.size)
+
+    def _check_index(self, idx):
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError('PopulationStore index out of range')
+        return idx
+
+    def _packed_data(self, idx):
+        offset, length, generation = self._record(idx)
+        nbytes = (length + BASES_PER_BYTE - 1) // BASES_PER_BYTE
+        if not nbytes:
+            return '', 0
+        return buffer(self._data_map, offset, nbytes), length
+
+    def append(self, strands, generation):
+        """ Append the strands of a generation. Generations must be appended in
+            increasing order. Returns the number of strands written. """
+        last = self.last_generation()
+        if last is not None and generation < last:
+            raise ValueError('Generation %d is before the last stored generation %d' % (generation, last))
+
+        count = 0
+        data_chunks = []
+        index_chunks = []
+        for strand in strands:
+            packed = pack(strand.strand)
+            data_chunks.append(packed)
+            index_chunks.append(INDEX_RECORD.pack(self._data_size, len(strand.strand), generation))
+            self._data_size += len(packed)
+            count += 1
+            if len(index_chunks) >= APPEND_BATCH_SIZE:
+                self._write(data_chunks, index_chunks)
+                data_chunks = []
+                index_chunks = []
+        self._write(data_chunks, index_chunks)
+        return count
+
+    def _write(self, data_chunks, index_chunks):
+        # the sequences go to disk before the index records that point to them
+        self._data.write(''.join(data_chunks))
+        self._data.flush()
+        self._index.write(''.join(index_chunks))
+        self._index.flush()
+        self._length += len(index_chunks)
+        self._unmap()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, idx):
+        data, length = self._packed_data(self._check_index(idx))
+        return Strand._create(unpack(data, length))
+
+    def __iter__(self):
+        for idx in range(self._length):
+            yield self[idx]
+
+    def packed(self, idx):
+        """ The strand at idx as a PackedStrand, without unpacking or copying its
+            sequence. Its data is a view of the memory mapped file, which is only
+            valid until the next append or close. """
+        data, length = self._packed_data(self._check_index(idx))
+        return PackedStrand(data, length)
+
+    def generation_of(self, idx):
+        return self._record(self._check_index(idx))[2]
+
+    def last_generation(self):
+        """ The most recently appended generation, or None for an empty store """
+        if not self._length:
+            return None
+        return self.generation_of(-1)
+
+    def _generation_start(self, generation):
+        """ Index of the first strand of a generation at or after the given one """
+        lo, hi = 0, self._length
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[2] < generation:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def generation_range(self, generation):
+        """ (start, stop) indexes of the strands of a generation """
+        return self._generation_start(generation), self._generation_start(generation + 1)
+
+    def generation(self, generation):
+        """ Lazily iterate over the strands of a generation """
+        start, stop = self.generation_range(generation)
+        for idx in range(start, stop):
+            yield self[idx]
+
+    def generations(self):
+        """ All of the stored generation numbers, in order """
+        generations = []
+        idx = 0
+        while idx < self._length:
+            generation = self._record(idx)[2]
+            generations.append(generation)
+            idx = self._generation_start(generation + 1)
+        return generations
@@ -1,4 +1,6 @@
 BASES = ['A', 'C', 'G', 'T']
+# all the characters allowed in a strand string
+_VALID_CHARS = ''.join(BASES) + ''.join(BASES).lower()
 
 
 class InvalidStrand(Exception):
@@ -10,18 +12,44 @@ def _check_input(strand_str):
     if isinstance(strand_str, str) == False:
         raise InvalidStrand('Wrong type, must be a str')
 
-    for base in strand_str:
-        if base.upper() not in BASES:
-            raise InvalidStrand('Strand contains an invalid base unit')
+    # deleting all of the valid characters must leave nothing behind
+    if strand_str.translate(None, _VALID_CHARS):
+        raise InvalidStrand('Strand contains an invalid base unit')
 
     return strand_str
 
 
 class Strand(object):
-    """ Strand object is a container for the strand string. """
+    """ Strand object is an immutable container for the strand string. Strands
+        compare and hash by their sequence. """
+
+    __slots__ = ('_strand',)
 
     def __init__(self, strand_str):
-        self.strand = _check_input(strand_str).upper()
+        self._strand = _check_input(strand_str).upper()
+
+    @classmethod
+    def _create(cls, strand_str):
+        """ Wrap an upper case strand string that is known to be valid, skipping the checks """
+        strand = object.__new__(cls)
+        strand._strand = strand_str
+        return strand
+
+    @property
+    def strand(self):
+        return self._strand
+
+    def __eq__(self, other):
+        return isinstance(other, Strand) and self._strand == other._strand
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._strand)
+
+    def __reduce__(self):
+        return (Strand, (self._strand,))
 
     def __str__(self):
         return "%s(%s)" % (self.__class__.__name__, self.strand)